@@ -1,34 +1,117 @@
 from abc import ABC, abstractmethod
+from array import array
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; array('d') buffers work without it
+    np = None
+
+# ----------- Batch Helpers -----------
+def _is_ndarray(values):
+    return np is not None and isinstance(values, np.ndarray)
+
+def _apply_batch(func, a_values, b_values, masked=False):
+    """Run a batch that cannot fail per element; when masked, return it as
+    (results, []) to match the divisor batches."""
+    if len(a_values) != len(b_values):
+        raise ValueError("Operand batches must have the same length")
+    if _is_ndarray(a_values) or _is_ndarray(b_values):
+        results = func(np.asarray(a_values, dtype=float), np.asarray(b_values, dtype=float))
+    else:
+        # map() over a C-level operator avoids a Python frame per pair
+        results = array('d', map(func, a_values, b_values))
+    return (results, []) if masked else results
+
+def _apply_divisor_batch(func, a_values, b_values, masked, error):
+    """Run a division-like batch; zero divisors raise `error` or, when masked,
+    become NaN and are reported as (results, zero_indices)."""
+    if len(a_values) != len(b_values):
+        raise ValueError("Operand batches must have the same length")
+    if _is_ndarray(a_values) or _is_ndarray(b_values):
+        a_arr = np.asarray(a_values, dtype=float)
+        b_arr = np.asarray(b_values, dtype=float)
+        zero_mask = b_arr == 0
+        if not zero_mask.any():
+            results = func(a_arr, b_arr)
+            return (results, np.flatnonzero(zero_mask)) if masked else results
+        if not masked:
+            raise error
+        results = func(a_arr, np.where(zero_mask, 1.0, b_arr))
+        results[zero_mask] = np.nan
+        return results, np.flatnonzero(zero_mask)
+
+    zero_indices = [i for i, b in enumerate(b_values) if b == 0]
+    if not zero_indices:
+        results = array('d', map(func, a_values, b_values))
+        return (results, zero_indices) if masked else results
+    if not masked:
+        raise error
+    nan = float("nan")
+    results = array('d', (nan if b == 0 else func(a, b) for a, b in zip(a_values, b_values)))
+    return results, zero_indices
 
 # ----------- Strategy Interface -----------
 class Operation(ABC):
+    __slots__ = ()  # strategies are stateless, so one shared instance per type is safe
+
     @abstractmethod
     def execute(self, a, b):
         pass
 
+    def execute_batch(self, a_values, b_values, masked=False):
+        return _apply_batch(self.execute, a_values, b_values, masked)
+
 # ----------- Concrete Strategies -----------
 class Add(Operation):
+    __slots__ = ()
+
     def execute(self, a, b):
         return a + b
 
+    def execute_batch(self, a_values, b_values, masked=False):
+        return _apply_batch(operator.add, a_values, b_values, masked)
+
 class Subtract(Operation):
+    __slots__ = ()
+
     def execute(self, a, b):
         return a - b
 
+    def execute_batch(self, a_values, b_values, masked=False):
+        return _apply_batch(operator.sub, a_values, b_values, masked)
+
 class Multiply(Operation):
+    __slots__ = ()
+
     def execute(self, a, b):
         return a * b
 
+    def execute_batch(self, a_values, b_values, masked=False):
+        return _apply_batch(operator.mul, a_values, b_values, masked)
+
 class Divide(Operation):
+    __slots__ = ()
+
     def execute(self, a, b):
         if b == 0:
             raise ValueError("Cannot divide by zero")
         return a / b
 
+    def execute_batch(self, a_values, b_values, masked=False):
+        return _apply_divisor_batch(operator.truediv, a_values, b_values, masked,
+                                    ValueError("Cannot divide by zero"))
+
 class Mod(Operation):
+    __slots__ = ()
+
     def execute(self, a, b):
         return a % b
 
+    def execute_batch(self, a_values, b_values, masked=False):
+        return _apply_divisor_batch(operator.mod, a_values, b_values, masked,
+                                    ZeroDivisionError("integer modulo by zero"))
+
 # ----------- Strategy Factory -----------
 class OperationFactory:
     operation_map = {
@@ -46,9 +129,146 @@ class OperationFactory:
             raise ValueError(f"Unknown operation: {op_type}")
         return op_cls()  # Return instance of strategy
 
+    @staticmethod
+    def get_operation(op_type: str) -> Operation:
+        """Return the shared, preallocated strategy for op_type (flyweight)."""
+        operation = _OPERATION_FLYWEIGHTS.get(op_type.lower())
+        if operation is None:
+            raise ValueError(f"Unknown operation: {op_type}")
+        return operation
+
+_OPERATION_FLYWEIGHTS = {name: op_cls() for name, op_cls in OperationFactory.operation_map.items()}
 
-# ----------- Singleton Calculator -----------
+
+# ----------- Compiled Expressions -----------
+import ast
+import sys
 import threading
+from collections import OrderedDict
+
+def _is_batch(value):
+    return hasattr(value, "__len__")
+
+def _broadcast(value, like):
+    if _is_ndarray(like):
+        return np.full(len(like), value, dtype=float)
+    return array('d', [value]) * len(like)
+
+class ExpressionNode(ABC):
+    @abstractmethod
+    def evaluate(self, env):
+        pass
+
+class ConstantNode(ExpressionNode):
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, env):
+        return self.value
+
+class VariableNode(ExpressionNode):
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, env):
+        if self.name not in env:
+            raise ValueError(f"Missing value for variable: {self.name}")
+        return env[self.name]
+
+class OperationNode(ExpressionNode):
+    def __init__(self, operation: Operation, left: ExpressionNode, right: ExpressionNode):
+        self.operation = operation
+        self.left = left
+        self.right = right
+
+    def evaluate(self, env):
+        a = self.left.evaluate(env)
+        b = self.right.evaluate(env)
+        a_batch, b_batch = _is_batch(a), _is_batch(b)
+        if not a_batch and not b_batch:
+            return self.operation.execute(a, b)
+        if not a_batch:
+            a = _broadcast(a, b)
+        elif not b_batch:
+            b = _broadcast(b, a)
+        return self.operation.execute_batch(a, b)
+
+class ExpressionCompiler:
+    operator_map = {
+        ast.Add: "add",
+        ast.Sub: "subtract",
+        ast.Mult: "multiply",
+        ast.Div: "divide",
+        ast.Mod: "mod"
+    }
+
+    @staticmethod
+    def compile(expr: str) -> ExpressionNode:
+        try:
+            tree = ast.parse(expr, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {expr}") from e
+        return ExpressionCompiler._build(tree.body)
+
+    @staticmethod
+    def _build(node) -> ExpressionNode:
+        if isinstance(node, ast.BinOp):
+            op_type = ExpressionCompiler.operator_map.get(type(node.op))
+            if not op_type:
+                raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+            return OperationNode(OperationFactory.get_operation(op_type),
+                                 ExpressionCompiler._build(node.left),
+                                 ExpressionCompiler._build(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = ExpressionCompiler._build(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            return OperationNode(OperationFactory.get_operation("subtract"), ConstantNode(0), operand)
+        if isinstance(node, ast.Name):
+            return VariableNode(node.id)
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return ConstantNode(node.value)
+        raise ValueError(f"Unsupported expression element: {ast.dump(node)}")
+
+class ExpressionCache:
+    """Bounded LRU cache of compiled expression trees keyed by source string."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, expr: str) -> ExpressionNode:
+        with self.__lock:
+            compiled = self.__entries.get(expr)
+            if compiled is not None:
+                self.__entries.move_to_end(expr)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        compiled = ExpressionCompiler.compile(expr)
+        with self.__lock:
+            self.__entries[expr] = compiled
+            self.__entries.move_to_end(expr)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self.__lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self.__entries), "maxsize": self.maxsize}
+
+
+# ----------- Singleton Calculator -----------
 
 class Calculator:
     __instance = None
@@ -58,6 +278,7 @@ class Calculator:
         if Calculator.__instance is not None:
             raise Exception("Use get_instance() instead of creating Calculator directly")
         self.strategy = None
+        self.expression_cache = ExpressionCache()
 
     @classmethod
     def get_instance(cls):
@@ -66,16 +287,201 @@ class Calculator:
                 if cls.__instance is None:
                     cls.__instance = super(Calculator, cls).__new__(cls)
                     cls.__instance.strategy = None
+                    cls.__instance.expression_cache = ExpressionCache()
         return cls.__instance
 
     def set_strategy(self, strategy: Operation):
         self.strategy = strategy
 
-    def calculate(self, a, b):
+    def calculate(self, *args):
+        """calculate(a, b) uses the strategy from set_strategy.
+        calculate(op_name, a, b) reads a shared flyweight strategy and touches no
+        Calculator state, so it is safe to call from many threads at once."""
+        if len(args) == 3:
+            op_name, a, b = args
+            return OperationFactory.get_operation(op_name).execute(a, b)
+        a, b = args
         if not self.strategy:
             raise Exception("No strategy set")
         return self.strategy.execute(a, b)
 
+    def calculate_many(self, op, a_values, b_values, masked=False):
+        """Apply one operation across paired operand batches without touching the current strategy."""
+        strategy = OperationFactory.get_operation(op) if isinstance(op, str) else op
+        return strategy.execute_batch(a_values, b_values, masked=masked)
+
+    def evaluate(self, expr: str, **variables):
+        """Evaluate an expression such as "(a + b) * c % d"; compiled trees are cached by source."""
+        return self.expression_cache.get(expr).evaluate(variables)
+
+    def cache_info(self):
+        return self.expression_cache.info()
+
+    def calculate_file(self, op_type: str, input_path: str, output_path: str, **options):
+        """Stream operand pairs from a binary or CSV file; see stream_calculate."""
+        return stream_calculate(op_type, input_path, output_path, **options)
+
+
+# ----------- Streaming Pipeline -----------
+import csv
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Binary inputs are fixed-width records of two little-endian float64 operands;
+# binary outputs are one little-endian float64 result per record.
+OPERAND_RECORD = struct.Struct("<dd")
+
+def _run_chunk(operation, a_values, b_values, masked):
+    if masked:
+        results, zero_indices = operation.execute_batch(a_values, b_values, masked=True)
+        return results, len(zero_indices)
+    return operation.execute_batch(a_values, b_values), 0
+
+def _stream_binary_range(op_type, input_path, output_path, start, end, chunk_records, masked):
+    operation = OperationFactory.get_operation(op_type)
+    records = zero_divisors = 0
+    step = chunk_records * OPERAND_RECORD.size
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        if start >= end:
+            return records, zero_divisors
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(start, end, step):
+                values = array('d')
+                values.frombytes(mm[offset:min(offset + step, end)])
+                if sys.byteorder != "little":
+                    values.byteswap()
+                results, zeros = _run_chunk(operation, values[0::2], values[1::2], masked)
+                if sys.byteorder != "little":
+                    results.byteswap()
+                results.tofile(dst)
+                records += len(results)
+                zero_divisors += zeros
+    return records, zero_divisors
+
+def _stream_csv_range(op_type, input_path, output_path, start, end, chunk_records, masked):
+    """Process the "a,b" lines whose first byte falls in [start, end)."""
+    operation = OperationFactory.get_operation(op_type)
+    records = zero_divisors = 0
+    with open(input_path, "rb") as src, open(output_path, "w", newline="") as dst:
+        writer = csv.writer(dst)
+        position = start
+        if start > 0:
+            src.seek(start - 1)
+            position = start - 1 + len(src.readline())  # the partial line belongs to the previous range
+        else:
+            src.seek(0)
+        a_values, b_values = array('d'), array('d')
+        while position < end:
+            line = src.readline()
+            if not line:
+                break
+            position += len(line)
+            row = line.strip()
+            if not row:
+                continue
+            a, b = row.split(b",")[:2]
+            a_values.append(float(a))
+            b_values.append(float(b))
+            if len(a_values) >= chunk_records:
+                results, zeros = _run_chunk(operation, a_values, b_values, masked)
+                writer.writerows([r] for r in results)
+                records += len(results)
+                zero_divisors += zeros
+                a_values, b_values = array('d'), array('d')
+        if a_values:
+            results, zeros = _run_chunk(operation, a_values, b_values, masked)
+            writer.writerows([r] for r in results)
+            records += len(results)
+            zero_divisors += zeros
+    return records, zero_divisors
+
+def _split_ranges(size, workers, align):
+    span = -(-size // workers)
+    span += (-span) % align
+    return [(start, min(start + span, size)) for start in range(0, size, span)] or [(0, 0)]
+
+def stream_calculate(op_type: str, input_path: str, output_path: str, fmt: str = "binary",
+                     chunk_records: int = 65536, workers: int = 1, masked: bool = False):
+    """Apply one operation to every operand pair in input_path, chunk by chunk,
+    writing results to output_path in the same format. With workers > 1 the
+    file is split into byte ranges processed by a process pool."""
+    OperationFactory.get_operation(op_type)  # fail fast on unknown operations
+    range_workers = {"binary": _stream_binary_range, "csv": _stream_csv_range}
+    worker = range_workers.get(fmt.lower())
+    if not worker:
+        raise ValueError(f"Unknown stream format: {fmt}")
+    size = os.path.getsize(input_path)
+    if fmt.lower() == "binary" and size % OPERAND_RECORD.size:
+        raise ValueError(f"Binary input size must be a multiple of {OPERAND_RECORD.size} bytes")
+
+    if workers <= 1:
+        records, zero_divisors = worker(op_type, input_path, output_path, 0, size, chunk_records, masked)
+        return {"records": records, "zero_divisors": zero_divisors}
+
+    align = OPERAND_RECORD.size if fmt.lower() == "binary" else 1
+    ranges = _split_ranges(size, workers, align)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        part_paths = [os.path.join(tmp_dir, f"part-{i}") for i in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker, op_type, input_path, part, start, end, chunk_records, masked)
+                       for part, (start, end) in zip(part_paths, ranges)]
+            counts = [f.result() for f in futures]
+        with open(output_path, "wb") as dst:
+            for part in part_paths:
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, dst)
+    return {"records": sum(c[0] for c in counts), "zero_divisors": sum(c[1] for c in counts)}
+
+
+# ----------- Dispatch Benchmark -----------
+import time
+
+def benchmark_dispatch(num_threads: int = 8, calls_per_thread: int = 50_000):
+    """Compare the shared set_strategy/calculate pair against stateless
+    calculate(op_name, a, b) under a thread pool; report wrong results and call cost."""
+    calc = Calculator.get_instance()
+    ops = ["add", "multiply"]
+    expected = {"add": lambda i: i + 3, "multiply": lambda i: i * 3}
+
+    def stateful_worker(op_name, errors):
+        wrong = 0
+        for i in range(calls_per_thread):
+            calc.set_strategy(OperationFactory.create_operation(op_name))
+            if calc.calculate(i, 3) != expected[op_name](i):
+                wrong += 1
+        errors.append(wrong)
+
+    def stateless_worker(op_name, errors):
+        wrong = 0
+        for i in range(calls_per_thread):
+            if calc.calculate(op_name, i, 3) != expected[op_name](i):
+                wrong += 1
+        errors.append(wrong)
+
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often so races surface quickly
+    try:
+        for label, worker in (("set_strategy + calculate(a, b)", stateful_worker),
+                              ("calculate(op_name, a, b)", stateless_worker)):
+            errors = []
+            threads = [threading.Thread(target=worker, args=(ops[t % len(ops)], errors))
+                       for t in range(num_threads)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            total_calls = num_threads * calls_per_thread
+            print(f"{label:32s} wrong results: {sum(errors):7d}  "
+                  f"{elapsed / total_calls * 1e9:8.1f} ns/call")
+    finally:
+        sys.setswitchinterval(old_interval)
+
 
 # ----------- Client Code (No direct object creation) -----------
 if __name__ == "__main__":
@@ -93,3 +499,32 @@ if __name__ == "__main__":
 
     calc.set_strategy(OperationFactory.create_operation("mod"))
     print("10 % 2 =", calc.calculate(10, 2))
+
+    # Batch evaluation over array('d') buffers
+    a_values = array('d', [10, 20, 30])
+    b_values = array('d', [2, 0, 5])
+    print("batch add:", list(calc.calculate_many("add", a_values, b_values)))
+    results, zero_indices = calc.calculate_many("divide", a_values, b_values, masked=True)
+    print("batch divide:", list(results), "zero divisors at", zero_indices)
+
+    # Compiled expressions reuse the cached tree across bindings
+    print("(a + b) * c % d =", calc.evaluate("(a + b) * c % d", a=2, b=3, c=4, d=6))
+    print("(a + b) * c % d =", calc.evaluate("(a + b) * c % d", a=1, b=1, c=5, d=4))
+    print("batch (a + b) * c =", list(calc.evaluate("(a + b) * c", a=a_values, b=b_values, c=2)))
+    print("cache:", calc.cache_info())
+
+    # Stateless dispatch through shared flyweight strategies
+    print("7 - 4 =", calc.calculate("subtract", 7, 4))
+
+    # Streaming a CSV of operand pairs through the pipeline
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_path = os.path.join(tmp_dir, "pairs.csv")
+        dst_path = os.path.join(tmp_dir, "results.csv")
+        with open(src_path, "w") as f:
+            f.write("6,3\n9,0\n8,2\n")
+        summary = calc.calculate_file("divide", src_path, dst_path, fmt="csv", masked=True)
+        with open(dst_path) as f:
+            print("streamed divide:", f.read().split(), summary)
+
+    if "--bench" in sys.argv:
+        benchmark_dispatch()
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 
 # ----------- Base Coffee (Component) -----------
 class Coffee(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_description(self):
         pass
@@ -49,32 +51,110 @@ class Topping(Coffee, ABC):
 
 # ----------- Concrete Toppings -----------
 class IceCream(Topping):
+    label = "Ice Cream"
+    price = 1.0
+
     def get_description(self):
-        return self.coffee.get_description() + ", Ice Cream"
+        return self.coffee.get_description() + ", " + self.label
     
     def get_price(self):
-        return self.coffee.get_price() + 1.0
+        return self.coffee.get_price() + self.price
 
 class Sugar(Topping):
+    label = "Sugar"
+    price = 0.5
+
     def get_description(self):
-        return self.coffee.get_description() + ", Sugar"
+        return self.coffee.get_description() + ", " + self.label
     
     def get_price(self):
-        return self.coffee.get_price() + 0.5
+        return self.coffee.get_price() + self.price
 
 class WhippedCream(Topping):
+    label = "Whipped Cream"
+    price = 1.5
+
     def get_description(self):
-        return self.coffee.get_description() + ", Whipped Cream"
+        return self.coffee.get_description() + ", " + self.label
     
     def get_price(self):
-        return self.coffee.get_price() + 1.5
+        return self.coffee.get_price() + self.price
 
 class Sweetener(Topping):
+    label = "Sweetener"
+    price = 0.7
+
     def get_description(self):
-        return self.coffee.get_description() + ", Sweetener"
+        return self.coffee.get_description() + ", " + self.label
     
     def get_price(self):
-        return self.coffee.get_price() + 0.7
+        return self.coffee.get_price() + self.price
+
+
+# ----------- Interned Drinks -----------
+from collections import OrderedDict
+import threading
+
+class InternedCoffee(Coffee):
+    """Shared, immutable drink with price and description computed up front."""
+    __slots__ = ("base_type", "topping_counts", "_description", "_price")
+
+    def __init__(self, base_type, topping_counts, description, price):
+        object.__setattr__(self, "base_type", base_type)
+        object.__setattr__(self, "topping_counts", topping_counts)
+        object.__setattr__(self, "_description", description)
+        object.__setattr__(self, "_price", price)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("InternedCoffee is immutable")
+
+    def get_description(self):
+        return self._description
+
+    def get_price(self):
+        return self._price
+
+class DrinkCache:
+    """Bounded LRU of interned drinks keyed by base plus topping multiset."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__drinks = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        with self.__lock:
+            drink = self.__drinks.get(key)
+            if drink is None:
+                self.misses += 1
+                return None
+            self.__drinks.move_to_end(key)
+            self.hits += 1
+            return drink
+
+    def put(self, key, drink):
+        with self.__lock:
+            # Another register may have interned the same drink meanwhile; keep the first one
+            drink = self.__drinks.setdefault(key, drink)
+            self.__drinks.move_to_end(key)
+            while len(self.__drinks) > self.maxsize:
+                self.__drinks.popitem(last=False)
+            return drink
+
+    def clear(self):
+        with self.__lock:
+            self.__drinks.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "size": len(self.__drinks), "maxsize": self.maxsize}
 
 
 # ----------- Coffee Factory -----------
@@ -110,10 +190,230 @@ class CoffeeFactory:
 
         return coffee
 
+    drink_cache = DrinkCache()
 
-# ----------- Singleton Order Manager -----------
-import threading
+    @staticmethod
+    def get_coffee(base_type: str, toppings: list[str]) -> InternedCoffee:
+        """Return the shared drink for this base and topping multiset; topping order does not matter."""
+        base_key = base_type.lower()
+        base_cls = CoffeeFactory.coffee_map.get(base_key)
+        if not base_cls:
+            raise ValueError(f"Unknown coffee type: {base_type}")
+        counts = dict.fromkeys(CoffeeFactory.topping_map, 0)
+        for topping in toppings:
+            topping_key = topping.lower()
+            if topping_key not in counts:
+                raise ValueError(f"Unknown topping: {topping}")
+            counts[topping_key] += 1
+        key = (base_key, tuple(counts.values()))
+
+        drink = CoffeeFactory.drink_cache.get(key)
+        if drink is not None:
+            return drink
+
+        base = base_cls()
+        description = base.get_description()
+        price = base.get_price()
+        for topping_key, count in counts.items():
+            topping_cls = CoffeeFactory.topping_map[topping_key]
+            for _ in range(count):
+                description += ", " + topping_cls.label
+                price += topping_cls.price
+        return CoffeeFactory.drink_cache.put(key, InternedCoffee(base_key, key[1], description, price))
+
+
+# ----------- Order Journal -----------
+import mmap
+import os
+import struct
+import tempfile
+
+class OrderJournal:
+    """Append-only binary write-ahead log of placed and cancelled orders.
+
+    Records are fixed width: op, base id, one count per topping and a cancel
+    index. Writes are group committed every group_size records, and a
+    background flusher writes any partial batch within max_delay seconds;
+    log_place/log_cancel return a sequence number that wait_durable() blocks
+    on until it is on disk. snapshot() writes the live orders to a side file under a new
+    generation and resets the journal, so replay only reads the snapshot plus
+    the records logged since."""
+
+    PLACE = 1
+    CANCEL = 2
+    header = struct.Struct("<4sI")  # magic, generation
+    record = struct.Struct(f"<BB{len(CoffeeFactory.topping_map)}BI")
+
+    def __init__(self, path, group_size=256, snapshot_every=100_000, sync=True, max_delay=0.005):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.group_size = group_size
+        self.max_delay = max_delay
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        self.records_since_snapshot = 0
+        self.__bases = list(CoffeeFactory.coffee_map)
+        self.__base_ids = {base: i for i, base in enumerate(self.__bases)}
+        self.__toppings = list(CoffeeFactory.topping_map)
+        self.__no_toppings = (0,) * len(self.__toppings)
+        self.__pending = bytearray()
+        self.__pending_count = 0
+        self.__appended = 0
+        self.__durable = 0
+        self.__lock = threading.Lock()
+        self.__flushed = threading.Condition(self.__lock)
+        self.__closed = threading.Event()
+        if not os.path.exists(path) or os.path.getsize(path) < self.header.size:
+            with open(path, "wb") as f:
+                f.write(self.header.pack(b"CJNL", self._read_generation(self.snapshot_path)))
+        else:
+            # Drop a torn trailing record from a crash so new appends stay record-aligned
+            body = os.path.getsize(path) - self.header.size
+            if body % self.record.size:
+                os.truncate(path, self.header.size + body // self.record.size * self.record.size)
+        self.__file = open(path, "ab")
+        self.__flusher = threading.Thread(target=self._flush_periodically, name="order-journal-flusher", daemon=True)
+        self.__flusher.start()
+
+    def _read_generation(self, path):
+        if not os.path.exists(path) or os.path.getsize(path) < self.header.size:
+            return 0
+        with open(path, "rb") as f:
+            return self.header.unpack(f.read(self.header.size))[1]
+
+    def _encode(self, coffee):
+        if isinstance(coffee, InternedCoffee):
+            return self.__base_ids[coffee.base_type], coffee.topping_counts
+        counts = dict.fromkeys(CoffeeFactory.topping_map.values(), 0)
+        while isinstance(coffee, Topping):
+            counts[type(coffee)] += 1
+            coffee = coffee.coffee
+        base_type = next(k for k, v in CoffeeFactory.coffee_map.items() if v is type(coffee))
+        return self.__base_ids[base_type], tuple(counts.values())
+
+    def pack_place(self, coffee):
+        """Encode a place record; raises ValueError for drinks the journal cannot represent"""
+        try:
+            base_id, counts = self._encode(coffee)
+            return self.record.pack(self.PLACE, base_id, *counts, 0)
+        except (StopIteration, KeyError, struct.error) as e:
+            raise ValueError(f"Cannot journal order {coffee.get_description()!r}: "
+                             "unregistered base or topping, or a topping count over 255") from e
+
+    def log_place(self, coffee):
+        return self._append(self.pack_place(coffee))
+
+    def append_record(self, data):
+        """Append a record already built by pack_place; returns its sequence number"""
+        return self._append(data)
+
+    def log_cancel(self, index):
+        return self._append(self.record.pack(self.CANCEL, 0, *self.__no_toppings, index))
+
+    def _append(self, data):
+        with self.__lock:
+            self.__pending += data
+            self.__pending_count += 1
+            self.records_since_snapshot += 1
+            self.__appended += 1
+            if self.__pending_count >= self.group_size:
+                self._flush_locked()
+            return self.__appended
+
+    def _flush_locked(self):
+        if not self.__pending:
+            return
+        self.__file.write(self.__pending)
+        self.__file.flush()
+        if self.sync:
+            os.fsync(self.__file.fileno())
+        self.__pending = bytearray()
+        self.__pending_count = 0
+        self.__durable = self.__appended
+        self.__flushed.notify_all()
+
+    def _flush_periodically(self):
+        while not self.__closed.wait(self.max_delay):
+            with self.__lock:
+                self._flush_locked()
+
+    def wait_durable(self, seq):
+        """Block until the record with this sequence number has been written (and fsynced if sync)"""
+        with self.__flushed:
+            while self.__durable < seq:
+                self.__flushed.wait()
+
+    def commit(self):
+        with self.__lock:
+            self._flush_locked()
+
+    def needs_snapshot(self):
+        return self.records_since_snapshot >= self.snapshot_every
+
+    def snapshot(self, orders):
+        """Persist the live orders and reset the journal to a new generation"""
+        with self.__lock:
+            self._flush_locked()
+            generation = self._read_generation(self.path) + 1
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.header.pack(b"CSNP", generation))
+                pack = self.record.pack
+                f.write(b"".join(pack(self.PLACE, *self._encode_flat(coffee), 0) for coffee in orders))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # A crash before this point leaves an older-generation journal, which replay ignores
+            self.__file.close()
+            with open(self.path, "wb") as f:
+                f.write(self.header.pack(b"CJNL", generation))
+                f.flush()
+                os.fsync(f.fileno())
+            self.__file = open(self.path, "ab")
+            self.records_since_snapshot = 0
+
+    def _encode_flat(self, coffee):
+        base_id, counts = self._encode(coffee)
+        return (base_id, *counts)
 
+    def replay(self):
+        """Rebuild the order list from the snapshot and the journal"""
+        self.commit()
+        orders = []
+        decoded = {}
+        snapshot_generation = self._replay_file(self.snapshot_path, orders, decoded)
+        if self._read_generation(self.path) >= snapshot_generation:
+            self._replay_file(self.path, orders, decoded)
+        return orders
+
+    def _replay_file(self, path, orders, decoded):
+        if not os.path.exists(path) or os.path.getsize(path) < self.header.size:
+            return 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            generation = self.header.unpack_from(mm, 0)[1]
+            # A torn trailing record from a crash mid-write is ignored
+            end = self.header.size + (len(mm) - self.header.size) // self.record.size * self.record.size
+            for fields in self.record.iter_unpack(mm[self.header.size:end]):
+                if fields[0] == self.PLACE:
+                    key = fields[1:-1]
+                    coffee = decoded.get(key)
+                    if coffee is None:
+                        toppings = [name for name, count in zip(self.__toppings, key[1:]) for _ in range(count)]
+                        coffee = decoded[key] = CoffeeFactory.get_coffee(self.__bases[key[0]], toppings)
+                    orders.append(coffee)
+                elif fields[0] == self.CANCEL and fields[-1] < len(orders):
+                    orders.pop(fields[-1])
+        return generation
+
+    def close(self):
+        self.__closed.set()
+        self.__flusher.join()
+        with self.__lock:
+            self._flush_locked()
+            self.__file.close()
+
+
+# ----------- Singleton Order Manager -----------
 class OrderManager:
     __instance = None
     __lock = threading.Lock()
@@ -131,22 +431,315 @@ class OrderManager:
                 if cls.__instance is None:
                     cls.__instance = super(OrderManager, cls).__new__(cls)
                     cls.__instance.__order = []
+                    cls.__instance.__order_lock = threading.Lock()
+                    cls.__instance.__journal = None
         return cls.__instance
 
+    def attach_journal(self, journal: OrderJournal):
+        """Restore orders from the journal, append (and log) any orders already
+        in memory after them, then log every change to it"""
+        with self.__order_lock:
+            restored = journal.replay()
+            seq = 0
+            for coffee in self.__order:
+                seq = journal.log_place(coffee)
+            self.__order = restored + self.__order
+            self.__journal = journal
+        journal.wait_durable(seq)
+
+    def _journal_snapshot_if_due(self):
+        if self.__journal is not None and self.__journal.needs_snapshot():
+            self.__journal.snapshot(self.__order)
+
+    # Journaled changes are encoded before the order list changes, so a drink the
+    # journal rejects never reaches memory. They return once their group commit is
+    # on disk; the wait happens outside the order lock so callers share one batch.
     def place_order(self, coffee):
-        self.__order.append(coffee)
+        with self.__order_lock:
+            journal = self.__journal
+            if journal is not None:
+                record = journal.pack_place(coffee)
+            self.__order.append(coffee)
+            if journal is not None:
+                seq = journal.append_record(record)
+                self._journal_snapshot_if_due()
+        if journal is not None:
+            journal.wait_durable(seq)
+
+    def place_orders(self, coffees):
+        """Append a batch of orders under a single lock acquisition"""
+        coffees = list(coffees)
+        with self.__order_lock:
+            journal = self.__journal
+            if journal is not None:
+                records = [journal.pack_place(coffee) for coffee in coffees]
+            self.__order.extend(coffees)
+            seq = 0
+            if journal is not None:
+                for record in records:
+                    seq = journal.append_record(record)
+                self._journal_snapshot_if_due()
+        if journal is not None:
+            journal.wait_durable(seq)
 
     def cancel_order(self, index):
-        if 0 <= index < len(self.__order):
-            return self.__order.pop(index)
-        else:
-            raise IndexError("Invalid order index")
+        with self.__order_lock:
+            if 0 <= index < len(self.__order):
+                coffee = self.__order.pop(index)
+                journal = self.__journal
+                if journal is not None:
+                    seq = journal.log_cancel(index)
+                    self._journal_snapshot_if_due()
+            else:
+                raise IndexError("Invalid order index")
+        if journal is not None:
+            journal.wait_durable(seq)
+        return coffee
+
+    def get_orders(self):
+        with self.__order_lock:
+            return list(self.__order)
 
     def print_order(self):
         print("Your Order:")
-        for i, coffee in enumerate(self.__order, 1):
+        for i, coffee in enumerate(self.get_orders(), 1):
             print(f"{i}. {coffee.get_description()} - ${coffee.get_price():.2f}")
 
+
+# ----------- Sharded Order Intake -----------
+from collections import deque
+import sys
+import time
+
+class OrderIntake:
+    """Per-register intake queues drained in batches by one consumer thread.
+
+    Registers only append to their own deque (atomic, no shared lock), so many
+    registers can enqueue in parallel; the consumer takes the manager lock
+    once per batch instead of once per order."""
+
+    def __init__(self, manager: OrderManager, num_shards=8, batch_size=256, poll_interval=0.001):
+        self.manager = manager
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.drained = 0
+        self.__shards = [deque() for _ in range(num_shards)]
+        self.__running = False
+        self.__consumer = None
+
+    def submit(self, register_id, coffee):
+        self.__shards[register_id % len(self.__shards)].append(coffee)
+
+    def pending(self):
+        return sum(len(shard) for shard in self.__shards)
+
+    def drain_once(self):
+        batch = []
+        for shard in self.__shards:
+            # Only the consumer pops, so len() never overstates what is available
+            for _ in range(min(len(shard), self.batch_size)):
+                batch.append(shard.popleft())
+        if batch:
+            self.manager.place_orders(batch)
+            self.drained += len(batch)
+        return len(batch)
+
+    def _consume(self):
+        while self.__running:
+            if not self.drain_once():
+                time.sleep(self.poll_interval)
+
+    def start(self):
+        if self.__consumer is None:
+            self.__running = True
+            self.__consumer = threading.Thread(target=self._consume, daemon=True)
+            self.__consumer.start()
+
+    def stop(self):
+        """Stop the consumer and drain whatever is still queued"""
+        if self.__consumer is not None:
+            self.__running = False
+            self.__consumer.join()
+            self.__consumer = None
+        while self.drain_once():
+            pass
+
+
+def benchmark_intake(num_registers=8, orders_per_register=20_000):
+    """Stress the sharded intake from many register threads; checks every order lands exactly once."""
+    manager = OrderManager.get_instance()
+    already_placed = len(manager.get_orders())
+    intake = OrderIntake(manager, num_shards=num_registers)
+    submitted = [[CoffeeFactory.create_coffee("latte", ["sugar"]) for _ in range(orders_per_register)]
+                 for _ in range(num_registers)]
+
+    def register(register_id):
+        for coffee in submitted[register_id]:
+            intake.submit(register_id, coffee)
+
+    threads = [threading.Thread(target=register, args=(r,)) for r in range(num_registers)]
+    start = time.perf_counter()
+    intake.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    intake.stop()
+    elapsed = time.perf_counter() - start
+
+    placed = manager.get_orders()[already_placed:]
+    expected = {id(coffee) for orders in submitted for coffee in orders}
+    placed_ids = [id(coffee) for coffee in placed]
+    total = num_registers * orders_per_register
+    print(f"{num_registers} registers, {total} orders in {elapsed:.3f}s "
+          f"({total / elapsed:,.0f} orders/sec)")
+    print(f"lost: {len(expected - set(placed_ids))}, double-counted: {len(placed_ids) - len(set(placed_ids))}")
+
+
+# ----------- Asyncio Order Pipeline -----------
+import asyncio
+import random
+
+class OrderTicket:
+    __slots__ = ("coffee", "enqueued_at", "started_at", "finished_at", "done")
+
+    def __init__(self, coffee, done):
+        self.coffee = coffee
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self.done = done
+
+    @property
+    def queue_latency(self):
+        return self.started_at - self.enqueued_at
+
+    @property
+    def service_latency(self):
+        return self.finished_at - self.started_at
+
+class AsyncOrderPipeline:
+    """Bounded asyncio queue feeding a pool of barista workers.
+
+    place_order_async records the order with the OrderManager in an executor
+    thread, waits while the queue is full (backpressure), and returns a future that resolves to the
+    OrderTicket once a barista has prepared the drink."""
+
+    def __init__(self, manager: OrderManager, num_baristas=3, queue_size=64, prep_time=0.01, max_samples=10_000):
+        self.manager = manager
+        self.num_baristas = num_baristas
+        self.prep_time = prep_time
+        self.completed_count = 0
+        self.latency_samples = deque(maxlen=max_samples)  # (queue, service) seconds of recent orders
+        self.__queue = asyncio.Queue(maxsize=queue_size)
+        self.__workers = []
+
+    async def prepare(self, coffee):
+        """Simulated preparation; slower drinks with more toppings"""
+        await asyncio.sleep(self.prep_time * (1 + 0.25 * sum(getattr(coffee, "topping_counts", ()))))
+
+    async def _barista(self):
+        while True:
+            ticket = await self.__queue.get()
+            try:
+                ticket.started_at = time.perf_counter()
+                await self.prepare(ticket.coffee)
+                ticket.finished_at = time.perf_counter()
+                self.completed_count += 1
+                self.latency_samples.append((ticket.queue_latency, ticket.service_latency))
+                outcome = None
+            except Exception as e:
+                outcome = e
+            finally:
+                self.__queue.task_done()
+            # The caller may have cancelled its future (e.g. wait_for timed out); that must not stop the barista
+            if not ticket.done.done():
+                if outcome is None:
+                    ticket.done.set_result(ticket)
+                else:
+                    ticket.done.set_exception(outcome)
+
+    async def start(self):
+        if not self.__workers:
+            self.__workers = [asyncio.create_task(self._barista()) for _ in range(self.num_baristas)]
+
+    async def stop(self):
+        """Let queued orders finish, then cancel the baristas"""
+        await self.__queue.join()
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers = []
+
+    async def place_order_async(self, base_type: str, toppings: list[str]):
+        coffee = CoffeeFactory.get_coffee(base_type, toppings)
+        loop = asyncio.get_running_loop()
+        # A journaled manager blocks until the order is durable; keep that off the event loop
+        await loop.run_in_executor(None, self.manager.place_order, coffee)
+        ticket = OrderTicket(coffee, loop.create_future())
+        await self.__queue.put(ticket)
+        return ticket.done
+
+    def latency_stats(self):
+        def percentile(values, q):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
+        stats = {}
+        for label, values in (("queue", [q for q, _ in self.latency_samples]),
+                              ("service", [s for _, s in self.latency_samples])):
+            for q in (50, 95, 99):
+                stats[f"{label}_p{q}_ms"] = percentile(values, q) * 1e3
+        return stats
+
+
+async def simulate_load(num_orders=2000, arrival_rate=500.0, num_baristas=8, queue_size=64, prep_time=0.01):
+    """Poisson arrivals of random drinks; reports throughput and tail latency."""
+    rng = random.Random(7)
+    pipeline = AsyncOrderPipeline(OrderManager.get_instance(), num_baristas, queue_size, prep_time)
+    bases = list(CoffeeFactory.coffee_map)
+    toppings = list(CoffeeFactory.topping_map)
+    await pipeline.start()
+    start = time.perf_counter()
+    done = []
+    for _ in range(num_orders):
+        await asyncio.sleep(rng.expovariate(arrival_rate))
+        drink_toppings = rng.sample(toppings, rng.randrange(3))
+        done.append(await pipeline.place_order_async(rng.choice(bases), drink_toppings))
+    await asyncio.gather(*done)
+    elapsed = time.perf_counter() - start
+    await pipeline.stop()
+    print(f"{num_orders} orders, {num_baristas} baristas: {num_orders / elapsed:,.0f} orders/sec")
+    print("latency:", {k: round(v, 2) for k, v in pipeline.latency_stats().items()})
+
+def benchmark_journal(num_orders=1_000_000, cancel_every=10):
+    """Journal num_orders places (plus some cancels) and time a full replay."""
+    bases = list(CoffeeFactory.coffee_map)
+    toppings = list(CoffeeFactory.topping_map)
+    drinks = [CoffeeFactory.get_coffee(b, toppings[:n]) for b in bases for n in range(len(toppings) + 1)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        journal = OrderJournal(os.path.join(tmp_dir, "orders.journal"), group_size=4096,
+                               snapshot_every=num_orders // 2, sync=False)
+        live = []
+        start = time.perf_counter()
+        for i in range(num_orders):
+            journal.log_place(drinks[i % len(drinks)])
+            live.append(drinks[i % len(drinks)])
+            if i % cancel_every == 0:
+                journal.log_cancel(len(live) - 1)
+                live.pop()
+            if journal.needs_snapshot():
+                journal.snapshot(live)
+        journal.commit()
+        logged = time.perf_counter() - start
+        journal.close()
+
+        start = time.perf_counter()
+        restored = OrderJournal(journal.path).replay()
+        replayed = time.perf_counter() - start
+        print(f"journaled {num_orders} orders in {logged:.2f}s, replayed {len(restored)} in {replayed:.2f}s, "
+              f"match: {restored == live}")
+
+
 if __name__ == "__main__":
     # Get the singleton via accessor
     manager = OrderManager.get_instance()
@@ -160,3 +753,14 @@ if __name__ == "__main__":
     manager.place_order(coffee3)
 
     manager.print_order()
+
+    # Interned drinks: same base and topping multiset share one object
+    drink_a = CoffeeFactory.get_coffee("espresso", ["sugar", "sweetener"])
+    drink_b = CoffeeFactory.get_coffee("Espresso", ["sweetener", "sugar"])
+    print(f"{drink_a.get_description()} - ${drink_a.get_price():.2f}, shared: {drink_a is drink_b}")
+    print("Drink cache:", CoffeeFactory.drink_cache.stats())
+
+    if "--bench" in sys.argv:
+        benchmark_intake()
+        asyncio.run(simulate_load())
+        benchmark_journal()
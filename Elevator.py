@@ -1,7 +1,12 @@
 from enum import Enum
 from collections import deque
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+import bisect
+import itertools
+import queue
 import threading
+import time
 
 # --- Enums ---
 class Direction(Enum):
@@ -14,47 +19,124 @@ class ElevatorState(Enum):
     MOVING = "Moving"
     STOPPED = "Stopped"
 
+# --- Stop Schedulers ---
+class StopScheduler(ABC):
+    @abstractmethod
+    def add_stop(self, floor, current_floor, direction):
+        pass
+
+    @abstractmethod
+    def next_stop(self, current_floor, direction):
+        """Remove and return the next floor to serve, or None if there is none"""
+        pass
+
+    @abstractmethod
+    def pending(self):
+        pass
+
+    def __len__(self):
+        return len(self.pending())
+
+class FifoScheduler(StopScheduler):
+    """Serves floors strictly in request order, duplicates included"""
+
+    def __init__(self):
+        self.requests = deque()
+
+    def add_stop(self, floor, current_floor, direction):
+        self.requests.append(floor)
+
+    def next_stop(self, current_floor, direction):
+        return self.requests.popleft() if self.requests else None
+
+    def pending(self):
+        return list(self.requests)
+
+    def __len__(self):
+        return len(self.requests)
+
+class LookScheduler(StopScheduler):
+    """LOOK: keep going in the current direction while there are stops ahead,
+    then reverse. Stops live in sorted, deduplicated up and down lists; every
+    up stop is at or above the car and every down stop at or below it."""
+
+    def __init__(self):
+        self.up_stops = []
+        self.down_stops = []
+
+    def add_stop(self, floor, current_floor, direction):
+        if floor > current_floor or (floor == current_floor and direction != Direction.DOWN):
+            stops = self.up_stops
+        else:
+            stops = self.down_stops
+        i = bisect.bisect_left(stops, floor)
+        if i == len(stops) or stops[i] != floor:
+            stops.insert(i, floor)
+
+    def next_stop(self, current_floor, direction):
+        if self.up_stops and (direction != Direction.DOWN or not self.down_stops):
+            return self.up_stops.pop(0)
+        if self.down_stops:
+            return self.down_stops.pop()
+        return None
+
+    def pending(self):
+        return self.up_stops + self.down_stops[::-1]
+
+    def __len__(self):
+        return len(self.up_stops) + len(self.down_stops)
+
 # --- Elevator ---
 class Elevator:
-    def __init__(self, id, max_floor):
+    def __init__(self, id, max_floor, scheduler: StopScheduler = None):
         self.id = id
         self.current_floor = 0
         self.direction = Direction.IDLE
         self.state = ElevatorState.IDLE
-        self.requests = deque()
+        self.scheduler = scheduler if scheduler is not None else LookScheduler()
         self.max_floor = max_floor
+        self.floors_travelled = 0
+        self.quiet = False      # suppress the per-move messages
+
+    @property
+    def requests(self):
+        return self.scheduler.pending()
 
     def add_request(self, floor):
         if 0 <= floor <= self.max_floor:
-            self.requests.append(floor)
+            self.scheduler.add_stop(floor, self.current_floor, self.direction)
 
     def move(self):
-        if not self.requests:
+        next_floor = self.scheduler.next_stop(self.current_floor, self.direction)
+        if next_floor is None:
             self.direction = Direction.IDLE
             self.state = ElevatorState.IDLE
             return
-        
-        next_floor = self.requests.popleft()
+
         if next_floor > self.current_floor:
             self.direction = Direction.UP
         elif next_floor < self.current_floor:
             self.direction = Direction.DOWN
-        else:
-            self.direction = Direction.IDLE
+        # A stop at the current floor keeps the sweep direction so LOOK doesn't reverse mid-sweep
 
         self.state = ElevatorState.MOVING
-        print(f"Elevator {self.id} moving {self.direction.name} to {next_floor}")
+        if not self.quiet:
+            print(f"Elevator {self.id} moving {self.direction.name} to {next_floor}")
 
+        self.floors_travelled += abs(next_floor - self.current_floor)
         self.current_floor = next_floor
         self.state = ElevatorState.STOPPED
-        print(f"Elevator {self.id} stopped at {self.current_floor}")
+        if not self.quiet:
+            print(f"Elevator {self.id} stopped at {self.current_floor}")
 
-        if not self.requests:
+        if not len(self.scheduler):
             self.state = ElevatorState.IDLE
             self.direction = Direction.IDLE
 
 # --- Strategy Pattern ---
 class ElevatorStrategy(ABC):
+    quiet = False  # suppress the per-selection message
+
     @abstractmethod
     def select_elevator(self, elevators, requested_floor):
         pass
@@ -64,40 +146,517 @@ class RoundRobinStrategy(ElevatorStrategy):
         self.index = 0
 
     def select_elevator(self, elevators, requested_floor):
-        print(f"Strategy for floor {requested_floor}")
+        if not self.quiet:
+            print(f"Strategy for floor {requested_floor}")
         elevator = elevators[self.index]
         self.index = (self.index + 1) % len(elevators)
         return elevator
 
+class NearestCarStrategy(ElevatorStrategy):
+    """Picks the car with the lowest estimated time to reach the floor.
+
+    The estimate follows the car's LOOK route: floors to travel (including
+    finishing the current sweep when the floor is behind it) plus stop_time
+    for each queued stop served on the way."""
+
+    def __init__(self, stop_time=1.0):
+        self.stop_time = stop_time
+
+    def estimate_time(self, elevator, floor):
+        cur = elevator.current_floor
+        scheduler = elevator.scheduler
+        if isinstance(scheduler, LookScheduler):
+            up, down = scheduler.up_stops, scheduler.down_stops
+        else:
+            pending = scheduler.pending()
+            up = sorted(f for f in pending if f >= cur)
+            down = sorted(f for f in pending if f < cur)
+        # The call joins the list LOOK's add_stop would put it in, which can change the sweep order
+        joins_up = floor > cur or (floor == cur and elevator.direction != Direction.DOWN)
+        has_up = bool(up) or joins_up
+        has_down = bool(down) or not joins_up
+        if has_up and (elevator.direction != Direction.DOWN or not has_down):
+            # Up sweep first (ascending), then the down sweep (descending)
+            if joins_up:
+                return floor - cur + self.stop_time * bisect.bisect_left(up, floor)
+            top = up[-1]
+            stops = len(up) + len(down) - bisect.bisect_right(down, floor)
+            return (top - cur) + (top - floor) + self.stop_time * stops
+        if not joins_up:
+            return cur - floor + self.stop_time * (len(down) - bisect.bisect_right(down, floor))
+        bottom = down[0]
+        stops = len(down) + bisect.bisect_left(up, floor)
+        return (cur - bottom) + (floor - bottom) + self.stop_time * stops
+
+    def select_elevator(self, elevators, requested_floor):
+        if not self.quiet:
+            print(f"Strategy for floor {requested_floor}")
+        return min(elevators, key=lambda e: (self.estimate_time(e, requested_floor), e.id))
+
+# --- Concurrent Runtime ---
+class HallCall:
+    """One caller's request; `future` resolves to this call once the car arrives"""
+    __slots__ = ("id", "floor", "elevator_id", "submitted", "latency", "future")
+
+    def __init__(self, id, floor):
+        self.id = id
+        self.floor = floor
+        self.elevator_id = None
+        self.submitted = time.perf_counter()
+        self.latency = None
+        self.future = Future()
+
+_SHUTDOWN = object()
+
+class ElevatorWorker(threading.Thread):
+    """Drives one Elevator from its own thread. Hall calls arrive on a
+    thread-safe inbox; the car's scheduler is only touched under the
+    controller's dispatch lock, so strategies see a consistent car while
+    selecting. Calls waiting at a floor are completed when the car stops there."""
+
+    def __init__(self, elevator: Elevator, dispatch_lock, seconds_per_floor=0.0):
+        super().__init__(name=f"elevator-{elevator.id}", daemon=True)
+        self.elevator = elevator
+        self.inbox = queue.Queue()
+        self.dispatch_lock = dispatch_lock
+        self.seconds_per_floor = seconds_per_floor
+        self.waiting = {}    # floor -> [HallCall]
+        self.latencies = []
+        self.served = 0
+        self.cancelled = 0
+
+    def run(self):
+        stopping = False
+        while not stopping or self.waiting:
+            try:
+                item = self.inbox.get(block=not self.waiting and not stopping)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item is _SHUTDOWN:
+                    stopping = True
+                else:
+                    self._accept(item)
+                try:
+                    item = self.inbox.get_nowait()
+                except queue.Empty:
+                    item = None
+            if self.waiting:
+                self._advance()
+
+    def _accept(self, call):
+        with self.dispatch_lock:
+            self.elevator.add_request(call.floor)
+        self.waiting.setdefault(call.floor, []).append(call)
+
+    def _advance(self):
+        with self.dispatch_lock:
+            start = self.elevator.current_floor
+            self.elevator.move()
+            floor = self.elevator.current_floor
+        if self.seconds_per_floor:
+            time.sleep(abs(floor - start) * self.seconds_per_floor)
+        now = time.perf_counter()
+        for call in self.waiting.pop(floor, ()):
+            # A caller may have cancelled its future; that must not stop the worker
+            if not call.future.set_running_or_notify_cancel():
+                self.cancelled += 1
+                continue
+            call.latency = now - call.submitted
+            self.latencies.append(call.latency)
+            self.served += 1
+            call.future.set_result(call)
+
 # --- Singleton Elevator Controller ---
 class ElevatorController:
     __instance = None
     __lock = threading.Lock()
 
-    def __init__(self, num_elevators: int, max_floor: int, strategy: ElevatorStrategy = None):
+    def __init__(self, num_elevators: int, max_floor: int, strategy: ElevatorStrategy = None,
+                 scheduler_cls=LookScheduler):
         if ElevatorController.__instance is not None:
             raise Exception("Use get_instance() instead of creating ElevatorController directly")
-        self.__elevators = [Elevator(i, max_floor) for i in range(num_elevators)]
-        self.strategy = strategy or RoundRobinStrategy()
+        self._init_controller(num_elevators, max_floor, strategy, scheduler_cls)
 
     @classmethod
-    def get_instance(cls, num_elevators: int = 2, max_floor: int = 10, strategy: ElevatorStrategy = None):
+    def get_instance(cls, num_elevators: int = 2, max_floor: int = 10, strategy: ElevatorStrategy = None,
+                     scheduler_cls=LookScheduler):
         if cls.__instance is None:
             with cls.__lock:
                 if cls.__instance is None:
                     cls.__instance = super(ElevatorController, cls).__new__(cls)
-                    cls.__instance.__elevators = [Elevator(i, max_floor) for i in range(num_elevators)]
-                    cls.__instance.strategy = strategy or RoundRobinStrategy()
+                    cls.__instance._init_controller(num_elevators, max_floor, strategy, scheduler_cls)
         return cls.__instance
 
+    def _init_controller(self, num_elevators, max_floor, strategy, scheduler_cls):
+        self.__elevators = [Elevator(i, max_floor, scheduler_cls()) for i in range(num_elevators)]
+        self.strategy = strategy or RoundRobinStrategy()
+        self.max_floor = max_floor
+        self.__dispatch_lock = threading.Lock()
+        self.__workers = []
+        self.__call_ids = itertools.count()
+        self.__latencies = []
+        self.__saved_quiet = None   # (per-elevator quiet, strategy quiet) from before start()
+
     def request_elevator(self, floor):
-        elevator = self.strategy.select_elevator(self.__elevators, floor)
-        elevator.add_request(floor)
+        """Assign a hall call. While the runtime is running this returns the call's future."""
+        if self.__workers:
+            return self.submit(floor)
+        with self.__dispatch_lock:
+            elevator = self.strategy.select_elevator(self.__elevators, floor)
+            elevator.add_request(floor)
         print(f"Request for floor {floor} assigned to Elevator {elevator.id}")
 
     def step(self):
-        for elevator in self.__elevators:
-            elevator.move()
+        if self.__workers:
+            raise RuntimeError("Elevators are driven by their workers while the runtime is running")
+        with self.__dispatch_lock:
+            for elevator in self.__elevators:
+                elevator.move()
+
+    # Concurrent runtime
+    def start(self, seconds_per_floor=0.0, verbose=False):
+        """Run every elevator as its own worker thread; per-move and per-selection
+        messages are silenced unless verbose"""
+        with self.__dispatch_lock:
+            if self.__workers:
+                raise RuntimeError("Runtime already started")
+            self.__saved_quiet = ([elevator.quiet for elevator in self.__elevators], self.strategy.quiet)
+            for elevator in self.__elevators:
+                elevator.quiet = not verbose
+            self.strategy.quiet = not verbose
+            self.__workers = [ElevatorWorker(e, self.__dispatch_lock, seconds_per_floor) for e in self.__elevators]
+        for worker in self.__workers:
+            worker.start()
+
+    def submit(self, floor) -> Future:
+        """Thread-safe hall call; the future resolves to the HallCall when a car stops at the floor"""
+        if not 0 <= floor <= self.max_floor:
+            raise ValueError(f"Floor {floor} out of range 0..{self.max_floor}")
+        with self.__dispatch_lock:
+            if not self.__workers:
+                raise RuntimeError("Runtime is not running; call start() first")
+            call = HallCall(next(self.__call_ids), floor)
+            elevator = self.strategy.select_elevator(self.__elevators, floor)
+            call.elevator_id = elevator.id
+            self.__workers[elevator.id].inbox.put(call)
+        return call.future
+
+    def stop(self, timeout=None):
+        """Serve every outstanding call, stop the workers and return how many calls they served"""
+        with self.__dispatch_lock:
+            workers, self.__workers = self.__workers, []
+        for worker in workers:
+            worker.inbox.put(_SHUTDOWN)
+        for worker in workers:
+            worker.join(timeout)
+            self.__latencies.extend(worker.latencies)
+        if workers:
+            elevators_quiet, self.strategy.quiet = self.__saved_quiet
+            for elevator, quiet in zip(self.__elevators, elevators_quiet):
+                elevator.quiet = quiet
+        return sum(worker.served for worker in workers)
+
+    def latency_stats(self):
+        """Request-to-arrival latency percentiles over every call served so far"""
+        def percentile(values, q):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
+        latencies = self.__latencies + [lat for worker in self.__workers for lat in worker.latencies]
+        return {f"p{q}_ms": percentile(latencies, q) * 1e3 for q in (50, 95, 99)}
+
+# --- Scheduler Benchmark ---
+import contextlib
+import io
+import random
+import sys
+
+def benchmark_schedulers(num_requests=20_000, max_floor=30, loads=(0.05, 0.2, 0.5), seed=5):
+    """Total floors travelled by one car under FIFO vs LOOK for the same random request
+    process. Time is counted in floors moved plus one per stop, and load is the
+    chance of a new request per unit of time."""
+    for load in loads:
+        for scheduler_cls in (FifoScheduler, LookScheduler):
+            rng = random.Random(seed)
+            elevator = Elevator(0, max_floor, scheduler_cls())
+            issued = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                while issued < num_requests or len(elevator.scheduler):
+                    before = elevator.floors_travelled
+                    elevator.move()
+                    elapsed = elevator.floors_travelled - before + 1
+                    for _ in range(elapsed):
+                        if issued < num_requests and rng.random() < load:
+                            elevator.add_request(rng.randint(0, max_floor))
+                            issued += 1
+            print(f"load {load:4.2f} {scheduler_cls.__name__:>14}: {elevator.floors_travelled:,} floors travelled")
+
+def simulate_waits(strategy: ElevatorStrategy, num_cars=8, max_floor=40, num_calls=20_000, call_rate=0.5, seed=9):
+    """Hall calls arrive with probability call_rate per time unit; a car spends
+    one unit per floor plus one per stop. Returns (average, p95) wait."""
+    rng = random.Random(seed)
+    elevators = [Elevator(i, max_floor) for i in range(num_cars)]
+    busy_until = [0] * num_cars
+    waiting = [dict() for _ in range(num_cars)]   # per car: floor -> call times
+    waits = []
+    issued, t = 0, 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while issued < num_calls or any(waiting):
+            if issued < num_calls and rng.random() < call_rate:
+                floor = rng.randint(0, max_floor)
+                car = strategy.select_elevator(elevators, floor)
+                car.add_request(floor)
+                waiting[car.id].setdefault(floor, []).append(t)
+                issued += 1
+            for car in elevators:
+                if busy_until[car.id] > t:
+                    continue
+                before = car.current_floor
+                car.move()
+                if car.state == ElevatorState.IDLE and car.current_floor == before and not waiting[car.id].get(before):
+                    continue
+                arrival = t + abs(car.current_floor - before)
+                waits.extend(arrival - called for called in waiting[car.id].pop(car.current_floor, ()))
+                busy_until[car.id] = arrival + 1
+            t += 1
+    waits.sort()
+    return sum(waits) / len(waits), waits[int(0.95 * (len(waits) - 1))]
+
+def benchmark_strategies(num_cars=8, max_floor=40):
+    for strategy in (RoundRobinStrategy(), NearestCarStrategy()):
+        average, p95 = simulate_waits(strategy, num_cars, max_floor)
+        print(f"{type(strategy).__name__:>19}: average wait {average:6.1f}, p95 wait {p95:6.1f}")
+    cars = [Elevator(i, max_floor) for i in range(64)]
+    strategy = NearestCarStrategy()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for floor in range(10_000):
+            strategy.select_elevator(cars, floor % (max_floor + 1))
+        elapsed = time.perf_counter() - start
+    print(f"NearestCarStrategy selection over 64 cars: {elapsed / 10_000 * 1e6:.1f} us")
+
+def stress_runtime(num_elevators=8, max_floor=40, num_callers=5000, caller_threads=256,
+                   seconds_per_floor=0.0001, seed=11):
+    """Thousands of concurrent callers against the threaded runtime; checks that
+    every call completes exactly once at its own floor."""
+    from concurrent.futures import ThreadPoolExecutor
+    controller = object.__new__(ElevatorController)
+    controller._init_controller(num_elevators, max_floor, NearestCarStrategy(), LookScheduler)
+    floors = [random.Random(seed + i).randint(0, max_floor) for i in range(num_callers)]
+
+    def caller(floor):
+        call = controller.submit(floor).result(timeout=60)
+        return call.id, call.floor, floor
+
+    start = time.perf_counter()
+    controller.start(seconds_per_floor)
+    with ThreadPoolExecutor(caller_threads) as pool:
+        results = list(pool.map(caller, floors))
+    served = controller.stop()
+    elapsed = time.perf_counter() - start
+    ids = {call_id for call_id, _, _ in results}
+    misrouted = sum(1 for _, arrived, requested in results if arrived != requested)
+    assert len(ids) == num_callers and served == num_callers and not misrouted, \
+        f"{num_callers} calls, {len(ids)} unique completions, {served} served, {misrouted} misrouted"
+    stats = controller.latency_stats()
+    print(f"{num_callers:,} concurrent calls over {num_elevators} cars in {elapsed:.2f}s: none lost or duplicated; "
+          f"latency p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+
+# --- Vectorized Building Simulator ---
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only BuildingSimulator needs it
+    np = None
+
+class _BitmapStops:
+    """Read-only scheduler view over one car's row of the simulator's stop bitmap"""
+    __slots__ = ("row",)
+
+    def __init__(self, row):
+        self.row = row
+
+    def pending(self):
+        return np.flatnonzero(self.row).tolist()
+
+    def __len__(self):
+        return int(self.row.sum())
+
+class _CarView:
+    """Elevator-shaped view of one simulated car, so any ElevatorStrategy can select it"""
+    __slots__ = ("sim", "id", "scheduler")
+
+    def __init__(self, sim, car_id):
+        self.sim = sim
+        self.id = car_id
+        self.scheduler = _BitmapStops(sim.stops[car_id])
+
+    @property
+    def current_floor(self):
+        return int(self.sim.pos[self.id])
+
+    @property
+    def direction(self):
+        return Direction(int(self.sim.direction[self.id]))
+
+class BuildingSimulator:
+    """Time-stepped simulation of a whole building with all car state in NumPy
+    arrays: positions, directions, door dwell and an (cars x floors) stop bitmap.
+
+    One tick is the time to travel one floor. Cars run LOOK: keep going while
+    stops remain ahead, otherwise reverse or idle. Passengers arrive per the
+    traffic profile; each hall call is assigned by `strategy` (any
+    ElevatorStrategy, via lightweight car views) or, by default, by a
+    vectorized nearest-car cost over all cars at once."""
+
+    profiles = ("morning", "lunch", "random")
+
+    def __init__(self, num_cars=100, num_floors=60, profile="morning", passengers_per_hour=2000.0,
+                 strategy: ElevatorStrategy = None, seconds_per_floor=2.0, door_seconds=6.0,
+                 stop_time=2.0, seed=1):
+        if np is None:
+            raise ImportError("BuildingSimulator requires NumPy")
+        if profile not in self.profiles:
+            raise ValueError(f"Unknown traffic profile: {profile}")
+        self.num_cars = num_cars
+        self.num_floors = num_floors
+        self.profile = profile
+        self.passengers_per_hour = passengers_per_hour
+        self.strategy = strategy
+        self.seconds_per_floor = seconds_per_floor
+        self.door_ticks = max(1, round(door_seconds / seconds_per_floor))
+        self.stop_time = stop_time
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros(num_cars, dtype=np.int64)
+        self.direction = np.zeros(num_cars, dtype=np.int64)
+        self.dwell = np.zeros(num_cars, dtype=np.int64)
+        self.stops = np.zeros((num_cars, num_floors), dtype=bool)
+        self.floor_ids = np.arange(num_floors)
+        self.views = [_CarView(self, i) for i in range(num_cars)]
+
+    def _rate(self, hour):
+        """Passengers per hour at this time of day"""
+        def peak(center, width):
+            return math.exp(-0.5 * ((hour - center) / width) ** 2)
+        if self.profile == "morning":
+            return self.passengers_per_hour * (0.2 + 2.5 * peak(8.75, 0.6))
+        if self.profile == "lunch":
+            return self.passengers_per_hour * (0.2 + 2.0 * peak(12.5, 0.5))
+        return self.passengers_per_hour
+
+    def _trips(self, count):
+        top = self.num_floors - 1
+        origins = self.rng.integers(0, self.num_floors, count)
+        dests = (origins + self.rng.integers(1, self.num_floors, count)) % self.num_floors
+        if self.profile == "morning":
+            up_peak = self.rng.random(count) < 0.85
+            origins[up_peak] = 0
+            dests[up_peak] = self.rng.integers(1, top + 1, up_peak.sum())
+        elif self.profile == "lunch":
+            going_down = self.rng.random(count) < 0.5
+            origins[going_down] = self.rng.integers(1, top + 1, going_down.sum())
+            dests[going_down] = 0
+            origins[~going_down] = 0
+            dests[~going_down] = self.rng.integers(1, top + 1, (~going_down).sum())
+        return origins.tolist(), dests.tolist()
+
+    def _nearest_car(self, floor):
+        has_stops = self.stops.any(axis=1)
+        top = np.where(has_stops, self.num_floors - 1 - np.argmax(self.stops[:, ::-1], axis=1), self.pos)
+        bottom = np.where(has_stops, np.argmax(self.stops, axis=1), self.pos)
+        sweep_end = np.where(self.direction > 0, top, bottom)
+        moving_away = (self.direction != 0) & ((floor - self.pos) * self.direction < 0)
+        cost = np.where(moving_away,
+                        np.abs(sweep_end - self.pos) + np.abs(sweep_end - floor),
+                        np.abs(self.pos - floor))
+        cost = cost + self.stop_time * self.stops.sum(axis=1)
+        return int(np.argmin(cost))
+
+    def _assign(self, floor):
+        if self.strategy is None:
+            return self._nearest_car(floor)
+        return self.strategy.select_elevator(self.views, floor).id
+
+    def run(self, hours=24.0, drain=True):
+        num_floors = self.num_floors
+        car_ids = np.arange(self.num_cars)
+        tick_seconds = self.seconds_per_floor
+        ticks = int(hours * 3600 / tick_seconds)
+        waiting, riding = {}, {}    # car * num_floors + floor -> [(call tick, destination)] / [pickup tick]
+        waits, travels = [], []
+        floors_travelled = stops_made = 0
+        start = time.perf_counter()
+        t = 0
+        strategy_quiet = self.strategy is not None and self.strategy.quiet
+        if self.strategy is not None:
+            self.strategy.quiet = True  # no per-call selection messages
+        try:
+            while t < ticks or (drain and (waiting or riding)):
+                if t < ticks:
+                    arrivals = self.rng.poisson(self._rate(t * tick_seconds / 3600) * tick_seconds / 3600)
+                    if arrivals:
+                        for origin, dest in zip(*self._trips(arrivals)):
+                            car = self._assign(origin)
+                            self.stops[car, origin] = True
+                            waiting.setdefault(car * num_floors + origin, []).append((t, dest))
+
+                np.maximum(self.dwell - 1, 0, out=self.dwell)
+                ready = self.dwell == 0
+                serving = ready & self.stops[car_ids, self.pos]
+                for car in np.flatnonzero(serving).tolist():
+                    floor = int(self.pos[car])
+                    key = car * num_floors + floor
+                    self.stops[car, floor] = False
+                    travels.extend(t - pickup for pickup in riding.pop(key, ()))
+                    for called, dest in waiting.pop(key, ()):
+                        waits.append(t - called)
+                        self.stops[car, dest] = True
+                        riding.setdefault(car * num_floors + dest, []).append(t)
+                self.dwell[serving] = self.door_ticks
+                stops_made += int(serving.sum())
+
+                movers = ready & ~serving
+                has_up = (self.stops & (self.floor_ids > self.pos[:, None])).any(axis=1)
+                has_down = (self.stops & (self.floor_ids < self.pos[:, None])).any(axis=1)
+                look = np.where((self.direction > 0) & has_up, 1,
+                       np.where((self.direction < 0) & has_down, -1,
+                       np.where(has_up, 1, np.where(has_down, -1, 0))))
+                self.direction = np.where(movers, look, self.direction)
+                step = np.where(movers, look, 0)
+                self.pos += step
+                floors_travelled += int(np.abs(step).sum())
+                t += 1
+        finally:
+            if self.strategy is not None:
+                self.strategy.quiet = strategy_quiet
+
+        waits_s = np.asarray(waits, dtype=float) * tick_seconds
+        travels_s = np.asarray(travels, dtype=float) * tick_seconds
+        return {
+            "profile": self.profile,
+            "strategy": type(self.strategy).__name__ if self.strategy else "vectorized nearest car",
+            "cars": self.num_cars,
+            "floors": num_floors,
+            "passengers": len(waits),
+            "avg_wait_s": float(waits_s.mean()) if len(waits) else 0.0,
+            "p95_wait_s": float(np.percentile(waits_s, 95)) if len(waits) else 0.0,
+            "avg_travel_s": float(travels_s.mean()) if len(travels) else 0.0,
+            "p95_travel_s": float(np.percentile(travels_s, 95)) if len(travels) else 0.0,
+            "floors_travelled": floors_travelled,
+            "stops": stops_made,
+            # Energy proxy: each floor of travel costs 1, each stop/start cycle costs 2
+            "energy_proxy": floors_travelled + 2 * stops_made,
+            "wall_seconds": time.perf_counter() - start,
+        }
+
+def benchmark_building(num_cars=200, num_floors=80, passengers_per_hour=6000.0):
+    for profile in BuildingSimulator.profiles:
+        report = BuildingSimulator(num_cars, num_floors, profile, passengers_per_hour).run()
+        print(f"{profile:>8}: {report['passengers']:,} passengers, wait avg/p95 "
+              f"{report['avg_wait_s']:.0f}/{report['p95_wait_s']:.0f}s, travel avg/p95 "
+              f"{report['avg_travel_s']:.0f}/{report['p95_travel_s']:.0f}s, energy {report['energy_proxy']:,}, "
+              f"simulated a day in {report['wall_seconds']:.1f}s")
 
 # --- Client code (No direct object creation) ---
 if __name__ == "__main__":
@@ -109,3 +668,10 @@ if __name__ == "__main__":
 
     for _ in range(3):
         controller.step()
+
+    if "--bench" in sys.argv:
+        benchmark_schedulers()
+        benchmark_strategies()
+        stress_runtime()
+        if np is not None:
+            benchmark_building()
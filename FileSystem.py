@@ -1,3 +1,7 @@
+from collections import OrderedDict
+import sys
+import time
+
 class Node:
     def __init__(self, name):
         self.name = name
@@ -14,39 +18,103 @@ class Directory(Node):
         super().__init__(name)
         self.children = {}  # name -> Node
 
+_MISSING = object()
+
+class PathCache:
+    """Bounded LRU map from stripped path to Node, like a dentry cache.
+    A cached None is a negative entry: the path is known not to exist."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    def get(self, key):
+        node = self.__entries.get(key, _MISSING)
+        if node is _MISSING:
+            self.misses += 1
+        else:
+            self.__entries.move_to_end(key)
+            self.hits += 1
+        return node
+
+    def put(self, key, node):
+        self.__entries[key] = node
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop one path; enough when a name is created where nothing existed"""
+        self.__entries.pop(key, None)
+
+    def invalidate_subtree(self, key):
+        """Drop a path and everything cached below it (overwrite, remove, move)"""
+        prefix = key + "/"
+        for cached in [k for k in self.__entries if k == key or k.startswith(prefix)]:
+            del self.__entries[cached]
+
+    def clear(self):
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.__entries), "maxsize": self.maxsize}
+
 class FileSystem:
-    def __init__(self):
+    def __init__(self, cache_size=4096):
         self.root = Directory("/")
+        self.path_cache = PathCache(cache_size)
 
     def _traverse(self, path):
         if path == "/":
             return self.root
-        parts = path.strip("/").split("/")
+        key = path.strip("/")
+        node = self.path_cache.get(key)
+        if node is not _MISSING:
+            return node
         node = self.root
-        for part in parts:
-            if part not in node.children:
-                return None
+        for part in key.split("/"):
+            if node.isFile or part not in node.children:
+                node = None
+                break
             node = node.children[part]
+        self.path_cache.put(key, node)
         return node
 
-    def mkdir(self, path):
-        parts = path.strip("/").split("/")
+    def _create_dirs(self, parts):
         node = self.root
-        for part in parts:
+        for i, part in enumerate(parts):
             if part not in node.children:
                 node.children[part] = Directory(part)
+                self.path_cache.invalidate("/".join(parts[:i + 1]))
             node = node.children[part]
+        return node
+
+    def mkdir(self, path):
+        node = self._traverse(path)
+        if node is None or node.isFile:
+            self._create_dirs(path.strip("/").split("/"))
 
     def addFile(self, path, content):
         parts = path.strip("/").split("/")
         filename = parts[-1]
         dir_path = parts[:-1]
-        node = self.root
-        for part in dir_path:
-            if part not in node.children:
-                node.children[part] = Directory(part)
-            node = node.children[part]
+        node = self._traverse("/".join(dir_path)) if dir_path else self.root
+        if node is None or node.isFile:
+            node = self._create_dirs(dir_path)
+        key = "/".join(parts)
+        old = node.children.get(filename)
         node.children[filename] = File(filename, content)
+        if old is None:
+            self.path_cache.invalidate(key)
+        elif old.isFile:
+            self.path_cache.put(key, node.children[filename])
+        else:
+            self.path_cache.invalidate_subtree(key)
 
     def readFile(self, path):
         node = self._traverse(path)
@@ -60,9 +128,36 @@ class FileSystem:
             return [node.name]
         return sorted(node.children.keys())
 
+    def cache_info(self):
+        return self.path_cache.info()
+
+def benchmark_lookup(depths=(5, 10, 20, 50), files_per_dir=4, reads=200_000):
+    """readFile throughput with and without the path cache at several tree depths"""
+    for depth in depths:
+        results = {}
+        for cache_size in (0, 4096):
+            fs = FileSystem(cache_size)
+            base = "/" + "/".join(f"d{i}" for i in range(depth))
+            paths = [f"{base}/f{j}.txt" for j in range(files_per_dir)]
+            for p in paths:
+                fs.addFile(p, p)
+            probes = paths + [f"{base}/missing{j}.txt" for j in range(files_per_dir)]
+            fs.path_cache.clear()
+            start = time.perf_counter()
+            for i in range(reads):
+                fs.readFile(probes[i % len(probes)])
+            results[cache_size] = time.perf_counter() - start
+            info = fs.cache_info()
+        print(f"depth {depth:2}: uncached {reads / results[0]:,.0f} reads/s, "
+              f"cached {reads / results[4096]:,.0f} reads/s "
+              f"({results[0] / results[4096]:.1f}x, {info['hits']:,} hits / {info['misses']:,} misses)")
+
 fs = FileSystem()
 fs.mkdir("/a/b/c")
 fs.addFile("/a/b/c/file.txt", "Hello World")
 print(fs.readFile("/a/b/c/file.txt"))  # Hello World
 print(fs.ls("/a/b"))                   # ['c']
 print(fs.ls("/a/b/c/file.txt"))        # ['file.txt']
+
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_lookup()
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+import heapq
+import itertools
 import threading
 
 # ----------- Strategy Pattern -----------
@@ -31,14 +33,16 @@ class BorrowPolicyFactory:
 
 # ----------- Factory Pattern -----------
 class Book(ABC):
+    __slots__ = ("title",)
+
     def __init__(self, title):
         self.title = title
 
 class FictionBook(Book):
-    pass
+    __slots__ = ()
 
 class NonFictionBook(Book):
-    pass
+    __slots__ = ()
 
 class BookFactory:
     book_map = {
@@ -53,6 +57,204 @@ class BookFactory:
             raise ValueError(f"Unknown book type: {book_type}")
         return book_cls(title)
 
+# ----------- Catalog Search Index -----------
+import re
+
+def _tokenize(text):
+    return re.findall(r"\w+", text.lower())
+
+class _TrieNode:
+    __slots__ = ("children", "titles", "postings", "words", "shortest")
+
+    def __init__(self):
+        self.children = {}      # char -> _TrieNode
+        self.titles = None      # titles containing the word ending here
+        self.postings = 0       # postings of all words at or below this node
+        self.words = 0          # distinct words at or below this node
+        self.shortest = _NO_WORD  # fewest extra characters to complete a word from here
+
+_NO_WORD = 1 << 30
+
+class CatalogIndex:
+    """Incrementally maintained prefix trie over title words, holding each
+    word's posting set at its node, plus a title set per book type.
+
+    Results rank by completion (characters the query words leave to finish
+    their matching title words, so exact words come first), then title
+    length. search() expands the most selective query word one trie level at
+    a time, so completion only grows, and stops once `limit` results beat
+    anything a deeper level could produce. Words with a single completion are
+    checked by set intersection, other words against each title's cached words."""
+
+    def __init__(self):
+        self.__trie = _TrieNode()
+        self.__by_type = {}         # book type -> titles
+        self.__types = {}           # title -> book types stocked
+        self.__words = {}           # title -> its distinct words, for filtering candidates
+
+    def add(self, title, book_type):
+        self.__by_type.setdefault(book_type, set()).add(title)
+        types = self.__types.setdefault(title, set())
+        if types:
+            types.add(book_type)
+            return  # words already indexed for this title
+        types.add(book_type)
+        words = tuple(dict.fromkeys(_tokenize(title)))
+        for word in words:
+            path = [self.__trie]
+            for ch in word:
+                child = path[-1].children.get(ch)
+                if child is None:
+                    child = path[-1].children[ch] = _TrieNode()
+                path.append(child)
+            leaf = path[-1]
+            new_word = leaf.titles is None
+            if new_word:
+                leaf.titles = set()
+            leaf.titles.add(title)
+            size = len(word)
+            for depth, node in enumerate(path):
+                node.postings += 1
+                node.words += new_word
+                if size - depth < node.shortest:
+                    node.shortest = size - depth
+        self.__words[title] = words
+
+    def _node(self, prefix):
+        node = self.__trie
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _only_word(node):
+        """(titles, extra characters) of the single word below a node with words == 1"""
+        extra = 0
+        while node.titles is None:
+            node = next(iter(node.children.values()))
+            extra += 1
+        return node.titles, extra
+
+    def search(self, query, book_type=None, limit=10, accept=None):
+        """Top `limit` titles matching every query word exactly or by prefix;
+        accept(title), if given, must also hold"""
+        tokens = list(dict.fromkeys(_tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+        nodes = {}
+        for token in tokens:
+            node = self._node(token)
+            if node is None or not node.postings:
+                return []
+            nodes[token] = node
+        seed = min(tokens, key=lambda token: nodes[token].postings)
+
+        filters, fixed_extra, checked = [], 0, []
+        for token in tokens:
+            if token == seed:
+                continue
+            if nodes[token].words == 1:
+                titles, extra = self._only_word(nodes[token])
+                filters.append(titles)
+                fixed_extra += extra
+            else:
+                checked.append(token)
+        if book_type is not None:
+            filters.append(self.__by_type.get(book_type, set()))
+        bound_extra = fixed_extra + sum(nodes[token].shortest for token in checked)
+
+        filters.sort(key=len)
+        found = {}      # title -> rank key
+        frontier = [nodes[seed]]
+        level = 0
+        while frontier:
+            postings = [node.titles for node in frontier if node.titles is not None]
+            if postings:
+                if len(postings) == 1:
+                    candidates = postings[0]
+                    rest = filters
+                elif filters:
+                    # Probe the level's titles against a filter instead of materialising their union
+                    candidates = filters[0].intersection(itertools.chain.from_iterable(postings))
+                    rest = filters[1:]
+                else:
+                    candidates = set().union(*postings)
+                    rest = filters
+                for titles in rest:
+                    candidates = candidates & titles
+                for title in candidates:
+                    if title in found or (accept is not None and not accept(title)):
+                        continue
+                    extra = level + fixed_extra
+                    words = self.__words[title]
+                    for token in checked:
+                        best = min((len(word) for word in words if word.startswith(token)), default=None)
+                        if best is None:
+                            break
+                        extra += best - len(token)
+                    else:
+                        found[title] = (extra, len(title), title)
+            # Deeper levels complete the seed word by at least one more character
+            level += 1
+            if len(found) >= limit and sum(key[0] < level + bound_extra for key in found.values()) >= limit:
+                break
+            frontier = [child for node in frontier for child in node.children.values()]
+        return [key[2] for key in heapq.nsmallest(limit, found.values())]
+
+
+# ----------- Loans & Due Dates -----------
+from datetime import datetime, timedelta
+
+class Loan:
+    __slots__ = ("user", "book", "due_at", "active")
+
+    def __init__(self, user, book, due_at):
+        self.user = user
+        self.book = book
+        self.due_at = due_at
+        self.active = True
+
+class DueDateScheduler:
+    """Min-heap of (due date, loan) with lazy deletion: returns and renewals
+    mark or re-push entries in O(log n) and stale entries are dropped when
+    they reach the top, so queries cost O(k log n) for k loans returned."""
+
+    def __init__(self):
+        self.__heap = []
+        self.__seq = itertools.count()  # tie-breaker so loans are never compared
+        self.__live = 0
+
+    def __len__(self):
+        return self.__live
+
+    def schedule(self, loan: Loan):
+        heapq.heappush(self.__heap, (loan.due_at, next(self.__seq), loan))
+        self.__live += 1
+
+    def reschedule(self, loan: Loan, due_at):
+        loan.due_at = due_at
+        heapq.heappush(self.__heap, (due_at, next(self.__seq), loan))  # the old entry goes stale
+
+    def cancel(self, loan: Loan):
+        loan.active = False
+        self.__live -= 1
+
+    def due_before(self, moment):
+        """Active loans due at or before moment, earliest first"""
+        heap = self.__heap
+        found = []
+        while heap and heap[0][0] <= moment:
+            entry = heapq.heappop(heap)
+            loan = entry[2]
+            if loan.active and loan.due_at == entry[0]:
+                found.append(entry)
+        for entry in found:
+            heapq.heappush(heap, entry)
+        return [entry[2] for entry in found]
+
+
 # ----------- Singleton Pattern -----------
 class Library:
     __instance = None
@@ -61,8 +263,7 @@ class Library:
     def __init__(self):
         if Library.__instance is not None:
             raise Exception("Use get_instance() instead of creating Library directly")
-        self.__books = []
-        self.__users = []
+        self._init_storage()
 
     @classmethod
     def get_instance(cls):
@@ -70,27 +271,147 @@ class Library:
             with cls.__lock:
                 if cls.__instance is None:
                     cls.__instance = super(Library, cls).__new__(cls)
-                    cls.__instance.__books = []
-                    cls.__instance.__users = []
+                    cls.__instance._init_storage()
         return cls.__instance
 
+    def _init_storage(self, num_stripes=64):
+        self.__books = {}        # title -> available copies (used as a stack)
+        self.__copies = {}       # title -> total copies owned
+        self.__loans = {}        # user -> Loans currently out
+        self.__users = []
+        self.__index = CatalogIndex()
+        self.__due_dates = DueDateScheduler()
+        # Shelves are guarded by a lock striped on the title hash, so borrows of
+        # unrelated titles do not contend; loans, due dates and the search index
+        # each have a lock held only for their own short updates.
+        self.__stripes = [threading.Lock() for _ in range(num_stripes)]
+        self.__loans_lock = threading.Lock()
+        self.__index_lock = threading.Lock()
+
+    def _stripe(self, title):
+        return self.__stripes[hash(title) % len(self.__stripes)]
+
     def add_book(self, book: Book):
-        self.__books.append(book)
+        with self._stripe(book.title):
+            self.__books.setdefault(book.title, []).append(book)
+            self.__copies[book.title] = self.__copies.get(book.title, 0) + 1
+        with self.__index_lock:
+            self.__index.add(book.title, type(book))
+
+    def add_books(self, books):
+        """Insert a batch of books with the per-book lookups hoisted out of the loop"""
+        books = list(books)  # walked twice: shelving, then indexing
+        available, copies, stripe = self.__books, self.__copies, self._stripe
+        for book in books:
+            title = book.title
+            with stripe(title):
+                shelf = available.get(title)
+                if shelf is None:
+                    shelf = available[title] = []
+                shelf.append(book)
+                copies[title] = copies.get(title, 0) + 1
+        with self.__index_lock:
+            index_add = self.__index.add
+            for book in books:
+                index_add(book.title, type(book))
 
     def register_user(self, user):
         self.__users.append(user)
 
-    def borrow_book(self, user, book):
-        for b in self.__books:
-            if b.title == book.title:
-                duration = user.policy.borrow_duration()
-                print(f"{user.name} borrowed '{b.title}' for {duration} days")
-                self.__books.remove(b)
-                return
-        print(f"Book '{book.title}' is not available")
+    def register_users(self, users):
+        self.__users.extend(users)
+
+    def borrow_book(self, user, book, now=None):
+        with self._stripe(book.title):
+            copies = self.__books.get(book.title)
+            b = copies.pop() if copies else None
+        if b is None:
+            print(f"Book '{book.title}' is not available")
+            return None
+        duration = user.policy.borrow_duration()
+        loan = Loan(user, b, (now or datetime.now()) + timedelta(days=duration))
+        with self.__loans_lock:
+            self.__loans.setdefault(user, []).append(loan)
+            self.__due_dates.schedule(loan)
+        print(f"{user.name} borrowed '{b.title}' for {duration} days")
+        return b
+
+    def _find_loan(self, user, book):
+        """The loan of this exact copy if the user holds it, else any loan of the same title"""
+        match = None
+        for loan in self.__loans.get(user, ()):
+            if loan.book is book:
+                return loan
+            if match is None and loan.book.title == book.title:
+                match = loan
+        return match
+
+    def return_book(self, user, book):
+        with self.__loans_lock:
+            loan = self._find_loan(user, book)
+            if loan is not None:
+                loans = self.__loans[user]
+                loans.remove(loan)
+                if not loans:
+                    del self.__loans[user]
+                self.__due_dates.cancel(loan)
+        if loan is None:
+            print(f"{user.name} has no loan for '{book.title}'")
+            return False
+        with self._stripe(loan.book.title):
+            self.__books[loan.book.title].append(loan.book)
+        print(f"{user.name} returned '{loan.book.title}'")
+        return True
+
+    def renew_book(self, user, book):
+        """Extend a loan by the user's policy duration from its current due date"""
+        with self.__loans_lock:
+            loan = self._find_loan(user, book)
+            if loan is not None:
+                self.__due_dates.reschedule(loan, loan.due_at + timedelta(days=user.policy.borrow_duration()))
+        if loan is None:
+            print(f"{user.name} has no loan for '{book.title}'")
+            return None
+        print(f"{user.name} renewed '{loan.book.title}' until {loan.due_at:%Y-%m-%d}")
+        return loan.due_at
+
+    def overdue(self, as_of=None):
+        """Loans past their due date as of the given moment, earliest first"""
+        with self.__loans_lock:
+            return self.__due_dates.due_before(as_of or datetime.now())
+
+    def due_within(self, days, as_of=None):
+        """Loans falling due in the next `days` days, including overdue ones, earliest first"""
+        with self.__loans_lock:
+            return self.__due_dates.due_before((as_of or datetime.now()) + timedelta(days=days))
+
+    def available_copies(self, title):
+        return len(self.__books.get(title, ()))
+
+    def search(self, query, book_type=None, available_only=False, limit=10):
+        """Ranked titles whose words match every query word exactly or by prefix.
+        book_type is a key of BookFactory.book_map; availability is read live,
+        so borrowing and returning never touch the index."""
+        type_cls = None
+        if book_type is not None:
+            type_cls = BookFactory.book_map.get(book_type.lower())
+            if not type_cls:
+                raise ValueError(f"Unknown book type: {book_type}")
+        accept = self.__books.get if available_only else None
+        with self.__index_lock:
+            return self.__index.search(query, type_cls, limit, accept)
+
+    def total_copies(self, title):
+        return self.__copies.get(title, 0)
+
+    def loans_for(self, user):
+        with self.__loans_lock:
+            return list(self.__loans.get(user, ()))
 
 # ----------- User Factory -----------
 class User:
+    __slots__ = ("name", "policy")
+
     def __init__(self, name: str, policy: BorrowPolicy):
         self.name = name
         self.policy = policy
@@ -101,6 +422,209 @@ class UserFactory:
         policy = BorrowPolicyFactory.create_policy(policy_type)
         return User(name, policy)
 
+# ----------- Bulk Catalog Import -----------
+import csv
+import json
+import os
+import time
+import tracemalloc
+
+class CatalogImporter:
+    """Streams books ("type,title") or users ("name,policy") from CSV or JSONL
+    files into the Library in batches, reporting progress and load rate.
+
+    Users of the same policy type share one policy instance."""
+
+    def __init__(self, library, batch_size=10_000, progress_every=100_000, report=print):
+        self.library = library
+        self.batch_size = batch_size
+        self.progress_every = progress_every
+        self.report = report
+
+    def _rows(self, path, fields):
+        if os.path.splitext(path)[1].lower() == ".jsonl":
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield tuple(record[field] for field in fields)
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                for line_no, row in enumerate(reader):
+                    if not row:
+                        continue  # blank line
+                    if line_no == 0 and tuple(cell.strip().lower() for cell in row[:len(fields)]) == fields:
+                        continue  # optional header
+                    yield row[0], row[1]
+
+    def _load(self, path, fields, build, insert, label):
+        start = time.perf_counter()
+        batch, loaded = [], 0
+        for row in self._rows(path, fields):
+            batch.append(build(*row))
+            if len(batch) >= self.batch_size:
+                insert(batch)
+                loaded += len(batch)
+                batch = []
+                if self.progress_every and loaded % self.progress_every < self.batch_size:
+                    elapsed = time.perf_counter() - start
+                    self.report(f"{label}: {loaded:,} loaded ({loaded / elapsed:,.0f}/s)")
+        if batch:
+            insert(batch)
+            loaded += len(batch)
+        elapsed = time.perf_counter() - start
+        return {"records": loaded, "seconds": elapsed, "rate": loaded / elapsed if elapsed else 0.0}
+
+    def import_books(self, path):
+        book_map = BookFactory.book_map
+
+        def build(book_type, title):
+            book_cls = book_map.get(book_type.lower())
+            if not book_cls:
+                raise ValueError(f"Unknown book type: {book_type}")
+            return book_cls(title)
+
+        return self._load(path, ("type", "title"), build, self.library.add_books, "books")
+
+    def import_users(self, path):
+        policies = {}
+
+        def build(name, policy_type):
+            key = policy_type.lower()
+            policy = policies.get(key)
+            if policy is None:
+                policy = policies[key] = BorrowPolicyFactory.create_policy(key)
+            return User(name, policy)
+
+        return self._load(path, ("name", "policy"), build, self.library.register_users, "users")
+
+def measure_book_memory(count=100_000):
+    """Bytes per book record for the slotted Book versus a dict-backed equivalent."""
+    class DictBook:
+        def __init__(self, title):
+            self.title = title
+
+    titles = [f"Title {i}" for i in range(count)]
+    results = {}
+    for label, cls in (("dict-backed", DictBook), ("slotted", FictionBook)):
+        tracemalloc.start()
+        books = [cls(t) for t in titles]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = size / len(books)
+        del books
+    return results
+
+# ----------- Benchmark -----------
+import contextlib
+import io
+import random
+import sys
+import tempfile
+
+def benchmark_borrow(num_books=1_000_000, borrows=1_000):
+    """Borrow titles from the end of a large catalog: indexed Library vs the old list scan."""
+    titles = [f"Title {i}" for i in range(num_books)]
+    wanted = titles[-borrows:]
+    user = UserFactory.create_user("Bench", "student")
+
+    books = [BookFactory.create_book("fiction", t) for t in titles]
+    start = time.perf_counter()
+    for title in wanted[:10]:  # a full list scan is slow; time a few and scale
+        for b in books:
+            if b.title == title:
+                books.remove(b)
+                break
+    scan_per_borrow = (time.perf_counter() - start) / 10
+
+    library = object.__new__(Library)
+    library._init_storage()
+    for t in titles:
+        library.add_book(BookFactory.create_book("fiction", t))
+    requests = [BookFactory.create_book("fiction", t) for t in wanted]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for book in requests:
+            library.borrow_book(user, book)
+        index_per_borrow = (time.perf_counter() - start) / borrows
+
+    print(f"{num_books} books: list scan {scan_per_borrow * 1e6:,.1f} us/borrow, "
+          f"title index {index_per_borrow * 1e6:,.2f} us/borrow")
+
+def benchmark_search(num_titles=1_000_000, queries=200):
+    """Build a synthetic catalog and time ranked search queries."""
+    rng = random.Random(3)
+    words = ["history", "python", "ocean", "garden", "machine", "learning", "empire", "quantum",
+             "secret", "river", "night", "design", "systems", "winter", "dragon", "science"]
+    library = object.__new__(Library)
+    library._init_storage()
+    start = time.perf_counter()
+    for i in range(num_titles):
+        title = " ".join(rng.sample(words, 3)) + f" vol{i}"
+        library.add_book(BookFactory.create_book(rng.choice(["fiction", "nonfiction"]), title))
+    print(f"indexed {num_titles} titles in {time.perf_counter() - start:.1f}s")
+    for query in ["vol12345", "quantum drag vol99", "vol4242 sci", "history python ocean vol7"]:
+        start = time.perf_counter()
+        for _ in range(queries):
+            library.search(query, limit=10)
+        print(f"  {query!r}: {(time.perf_counter() - start) / queries * 1e3:.3f} ms/query")
+
+def benchmark_import(num_books=1_000_000):
+    """Write a synthetic JSONL catalog, stream it into a fresh Library and report memory per book."""
+    library = object.__new__(Library)
+    library._init_storage()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "books.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(num_books):
+                f.write(json.dumps({"type": "fiction" if i % 2 else "nonfiction", "title": f"Book {i}"}) + "\n")
+        stats = CatalogImporter(library, progress_every=num_books // 4).import_books(path)
+    print(f"imported {stats['records']:,} books in {stats['seconds']:.1f}s ({stats['rate']:,.0f}/s)")
+    print("bytes per book record:", {k: round(v) for k, v in measure_book_memory().items()})
+
+def stress_borrow(thread_counts=(1, 2, 4, 8), num_titles=1_000, copies_per_title=2, ops_per_thread=20_000):
+    """Threads borrow and return random titles; checks no copy is ever lent
+    twice at once and that every copy is back on the shelf at the end."""
+    titles = [f"Stress {i}" for i in range(num_titles)]
+    for num_threads in thread_counts:
+        library = object.__new__(Library)
+        library._init_storage()
+        library.add_books([BookFactory.create_book("fiction", t) for t in titles for _ in range(copies_per_title)])
+        holders = {}            # id(copy) -> thread currently holding it
+        double_lends = []
+
+        def worker(worker_id):
+            rng = random.Random(worker_id)
+            user = UserFactory.create_user(f"Stress{worker_id}", "student")
+            held = []
+            for _ in range(ops_per_thread):
+                if held and rng.random() < 0.5:
+                    b = held.pop(rng.randrange(len(held)))
+                    del holders[id(b)]
+                    library.return_book(user, b)
+                else:
+                    b = library.borrow_book(user, BookFactory.create_book("fiction", rng.choice(titles)))
+                    if b is not None:
+                        if holders.setdefault(id(b), worker_id) != worker_id:
+                            double_lends.append(b.title)
+                        held.append(b)
+            for b in held:
+                del holders[id(b)]
+                library.return_book(user, b)
+
+        threads = [threading.Thread(target=worker, args=(w,)) for w in range(num_threads)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+        shelved = sum(library.available_copies(t) for t in titles)
+        print(f"{num_threads:2d} threads: {num_threads * ops_per_thread / elapsed:,.0f} ops/s, "
+              f"double lends: {len(double_lends)}, copies back on shelf: {shelved}/{num_titles * copies_per_title}")
+
 # ----------- Client Code (No direct object creation) -----------
 if __name__ == "__main__":
     library = Library.get_instance()  # Singleton accessor
@@ -127,3 +651,24 @@ if __name__ == "__main__":
     # Borrow books
     library.borrow_book(users[0], BookFactory.create_book("fiction", "Harry Potter"))
     library.borrow_book(users[1], BookFactory.create_book("nonfiction", "Sapiens"))
+
+    # Multiple copies and returns
+    library.add_book(BookFactory.create_book("fiction", "Harry Potter"))
+    library.return_book(users[0], BookFactory.create_book("fiction", "Harry Potter"))
+    print(f"'Harry Potter' copies available: {library.available_copies('Harry Potter')}"
+          f" of {library.total_copies('Harry Potter')}")
+
+    print("Search 'harr':", library.search("harr"))
+    print("Search 'sap' (nonfiction):", library.search("sap", book_type="nonfiction"))
+
+    # Due dates: Bob's 30-day loan is overdue 40 days from now
+    later = datetime.now() + timedelta(days=40)
+    print("Overdue in 40 days:", [(loan.user.name, loan.book.title) for loan in library.overdue(later)])
+    library.renew_book(users[1], BookFactory.create_book("nonfiction", "Sapiens"))
+    print("Overdue in 40 days after renewal:", [(loan.user.name, loan.book.title) for loan in library.overdue(later)])
+
+    if "--bench" in sys.argv:
+        benchmark_borrow()
+        benchmark_search()
+        benchmark_import()
+        stress_borrow()
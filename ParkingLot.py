@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+import heapq
+import math
 import threading
+import time
 
 # ----------- Vehicle Types -----------
 class VehicleType:
@@ -45,12 +48,48 @@ class ParkingSpot:
         self.vehicle = None
         self.is_free = True
 
+# ----------- Free Spot Index -----------
+class FreeSpotIndex:
+    """Per-VehicleType min-heaps of free spots ordered by position in the lot
+    (position 0 is nearest the entrance).
+
+    Spots taken by any strategy stay in their heap until they surface and are
+    discarded, so take is O(1), release and nearest are O(log n) amortized."""
+
+    def __init__(self, spots):
+        self.__position = {spot.spot_id: i for i, spot in enumerate(spots)}
+        self.__heaps = {}
+        self.__queued = set()   # spot_ids currently present in a heap
+        for spot in spots:
+            if spot.is_free:
+                self.release(spot)
+
+    def nearest(self, vehicle_type):
+        heap = self.__heaps.get(vehicle_type)
+        while heap:
+            spot = heap[0][1]
+            if spot.is_free:
+                return spot
+            heapq.heappop(heap)
+            self.__queued.discard(spot.spot_id)
+        return None
+
+    def release(self, spot):
+        if spot.spot_id not in self.__queued:
+            heap = self.__heaps.setdefault(spot.vehicle_type, [])
+            heapq.heappush(heap, (self.__position[spot.spot_id], spot))
+            self.__queued.add(spot.spot_id)
+
 # ----------- Strategy Pattern -----------
 class ParkingStrategy(ABC):
     @abstractmethod
     def find_spot(self, spots, vehicle: Vehicle):
         pass
 
+    def find_spot_indexed(self, free_spots: FreeSpotIndex, spots, vehicle: Vehicle):
+        """Hook for strategies that can answer from the free-spot index; defaults to find_spot"""
+        return self.find_spot(spots, vehicle)
+
 class NearestSpotStrategy(ParkingStrategy):
     def find_spot(self, spots, vehicle: Vehicle):
         for spot in spots:
@@ -58,48 +97,321 @@ class NearestSpotStrategy(ParkingStrategy):
                 return spot
         return None
 
+    def find_spot_indexed(self, free_spots: FreeSpotIndex, spots, vehicle: Vehicle):
+        return free_spots.nearest(vehicle.vehicle_type)
+
+# ----------- Parking Level -----------
+class ParkingLevel:
+    """One level (or zone) of the lot with its own lock and free-spot index"""
+
+    def __init__(self, level_id: int, num_car_spots: int, num_bike_spots: int, prefix: str = ""):
+        self.level_id = level_id
+        self.spots = []
+        self.spots += [ParkingSpot(f"{prefix}C{i}", VehicleType.CAR) for i in range(num_car_spots)]
+        self.spots += [ParkingSpot(f"{prefix}B{i}", VehicleType.BIKE) for i in range(num_bike_spots)]
+        self.free_spots = FreeSpotIndex(self.spots)
+        self.occupied = {VehicleType.CAR: 0, VehicleType.BIKE: 0}
+        self.lock = threading.Lock()
+
+    def try_park(self, strategy: ParkingStrategy, vehicle: Vehicle):
+        with self.lock:
+            spot = strategy.find_spot_indexed(self.free_spots, self.spots, vehicle)
+            if spot and spot.park(vehicle):
+                self.occupied[spot.vehicle_type] += 1
+                return spot
+        return None
+
+    def leave(self, spot: ParkingSpot, plate_number: str = None):
+        """Free the spot and return the vehicle that was in it, if any. With
+        plate_number, only free it while that plate is still the one parked there."""
+        with self.lock:
+            vehicle = spot.vehicle
+            if plate_number is not None and (vehicle is None or vehicle.plate_number != plate_number):
+                return None
+            if not spot.is_free:
+                self.occupied[spot.vehicle_type] -= 1
+            spot.leave()
+            self.free_spots.release(spot)
+            return vehicle
+
+# ----------- Ticketing & Rates -----------
+class Ticket:
+    __slots__ = ("plate_number", "vehicle_type", "spot_id", "entry_time")
+
+    def __init__(self, plate_number, vehicle_type, spot_id, entry_time):
+        self.plate_number = plate_number
+        self.vehicle_type = vehicle_type
+        self.spot_id = spot_id
+        self.entry_time = entry_time
+
+class RateStrategy(ABC):
+    @abstractmethod
+    def calculate_fee(self, ticket: Ticket, exit_time: float) -> float:
+        pass
+
+class HourlyRateStrategy(RateStrategy):
+    """Charges per started hour, at a rate per vehicle type"""
+
+    def __init__(self, hourly_rates=None):
+        self.hourly_rates = hourly_rates or {VehicleType.CAR: 2.0, VehicleType.BIKE: 1.0}
+
+    def calculate_fee(self, ticket: Ticket, exit_time: float) -> float:
+        hours = max(1, math.ceil((exit_time - ticket.entry_time) / 3600))
+        return hours * self.hourly_rates[ticket.vehicle_type]
+
+class FlatRateStrategy(RateStrategy):
+    def __init__(self, flat_rates=None):
+        self.flat_rates = flat_rates or {VehicleType.CAR: 10.0, VehicleType.BIKE: 5.0}
+
+    def calculate_fee(self, ticket: Ticket, exit_time: float) -> float:
+        return self.flat_rates[ticket.vehicle_type]
+
 # ----------- Singleton Parking Lot -----------
 class ParkingLot:
     __instance = None
     __lock = threading.Lock()
 
-    def __init__(self, num_car_spots: int = 0, num_bike_spots: int = 0, strategy: ParkingStrategy = None):
+    def __init__(self, num_car_spots: int = 0, num_bike_spots: int = 0, strategy: ParkingStrategy = None,
+                 num_levels: int = 1):
         if ParkingLot.__instance is not None:
             raise Exception("Use get_instance() instead of creating ParkingLot directly")
-        self.__spots = []
-        self.__spots += [ParkingSpot(f"C{i}", VehicleType.CAR) for i in range(num_car_spots)]
-        self.__spots += [ParkingSpot(f"B{i}", VehicleType.BIKE) for i in range(num_bike_spots)]
-        self.strategy = strategy or NearestSpotStrategy()
+        self._init_spots(num_car_spots, num_bike_spots, strategy, num_levels)
 
     @classmethod
-    def get_instance(cls, num_car_spots: int = 0, num_bike_spots: int = 0, strategy: ParkingStrategy = None):
+    def get_instance(cls, num_car_spots: int = 0, num_bike_spots: int = 0, strategy: ParkingStrategy = None,
+                     num_levels: int = 1):
         if cls.__instance is None:
             with cls.__lock:
                 if cls.__instance is None:
                     cls.__instance = super(ParkingLot, cls).__new__(cls)
-                    cls.__instance.__spots = []
-                    cls.__instance.__spots += [ParkingSpot(f"C{i}", VehicleType.CAR) for i in range(num_car_spots)]
-                    cls.__instance.__spots += [ParkingSpot(f"B{i}", VehicleType.BIKE) for i in range(num_bike_spots)]
-                    cls.__instance.strategy = strategy or NearestSpotStrategy()
+                    cls.__instance._init_spots(num_car_spots, num_bike_spots, strategy, num_levels)
         return cls.__instance
 
-    def park_vehicle(self, vehicle: Vehicle):
-        spot = self.strategy.find_spot(self.__spots, vehicle)
-        if spot and spot.park(vehicle):
-            print(f"{vehicle.vehicle_type} {vehicle.plate_number} parked at spot {spot.spot_id}")
+    def _init_spots(self, num_car_spots, num_bike_spots, strategy, num_levels=1):
+        """num_car_spots and num_bike_spots are per level; multi-level spot ids are prefixed "L<n>-" """
+        self.__levels = [ParkingLevel(i, num_car_spots, num_bike_spots, f"L{i}-" if num_levels > 1 else "")
+                         for i in range(num_levels)]
+        self.__spot_map = {spot.spot_id: (level, spot) for level in self.__levels for spot in level.spots}
+        self.__tickets = {}     # plate -> Ticket, or None while a gate is parking that plate
+        self.__tickets_lock = threading.Lock()
+        self.strategy = strategy or NearestSpotStrategy()
+        self.rate_strategy = HourlyRateStrategy()
+        self.quiet = False      # suppress the per-operation messages (simulations, benchmarks)
+
+    @property
+    def levels(self):
+        return list(self.__levels)
+
+    def _levels_from(self, preferred_level):
+        # Preferred level first, then the others by distance from it
+        return sorted(self.__levels, key=lambda level: (abs(level.level_id - preferred_level), level.level_id))
+
+    def _park(self, vehicle: Vehicle, preferred_level: int = 0):
+        # Only one level's lock is held at a time
+        for level in self._levels_from(preferred_level):
+            spot = level.try_park(self.strategy, vehicle)
+            if spot is not None:
+                return spot
+        return None
+
+    def park_vehicle(self, vehicle: Vehicle, preferred_level: int = 0, now: float = None):
+        """Park on the preferred level, falling back to the nearest other levels,
+        and issue a ticket; a plate that is already parked is rejected"""
+        plate = vehicle.plate_number
+        with self.__tickets_lock:
+            if plate in self.__tickets:
+                if not self.quiet:
+                    print(f"{vehicle.vehicle_type} {plate} is already parked")
+                return False
+            self.__tickets[plate] = None  # reserve the plate while we look for a spot
+        spot = self._park(vehicle, preferred_level)
+        with self.__tickets_lock:
+            if spot is None:
+                del self.__tickets[plate]
+            else:
+                self.__tickets[plate] = Ticket(plate, vehicle.vehicle_type, spot.spot_id,
+                                               time.time() if now is None else now)
+        if spot is not None:
+            if not self.quiet:
+                print(f"{vehicle.vehicle_type} {plate} parked at spot {spot.spot_id}")
             return True
-        print(f"No available spot for {vehicle.vehicle_type} {vehicle.plate_number}")
+        if not self.quiet:
+            print(f"No available spot for {vehicle.vehicle_type} {plate}")
         return False
 
     def leave_spot(self, spot_id: str):
-        for spot in self.__spots:
-            if spot.spot_id == spot_id:
-                spot.leave()
+        entry = self.__spot_map.get(spot_id)
+        if entry is not None:
+            level, spot = entry
+            vehicle = level.leave(spot)
+            if vehicle is not None:
+                with self.__tickets_lock:
+                    ticket = self.__tickets.get(vehicle.plate_number)
+                    if ticket is not None and ticket.spot_id == spot_id:
+                        del self.__tickets[vehicle.plate_number]
+            if not self.quiet:
                 print(f"Spot {spot_id} is now free")
-                return True
-        print(f"Spot {spot_id} not found")
+            return True
+        if not self.quiet:
+            print(f"Spot {spot_id} not found")
         return False
 
+    def exit_vehicle(self, plate_number: str, now: float = None):
+        """Free the plate's spot and return its fee, or None if the plate is not parked"""
+        with self.__tickets_lock:
+            ticket = self.__tickets.get(plate_number)
+            if ticket is not None:
+                del self.__tickets[plate_number]
+        if ticket is None:
+            if not self.quiet:
+                print(f"No parked vehicle with plate {plate_number}")
+            return None
+        level, spot = self.__spot_map[ticket.spot_id]
+        # leave_spot may already have freed the spot and another car taken it
+        level.leave(spot, plate_number)
+        fee = self.rate_strategy.calculate_fee(ticket, time.time() if now is None else now)
+        if not self.quiet:
+            print(f"{ticket.vehicle_type} {plate_number} left spot {ticket.spot_id}, fee ${fee:.2f}")
+        return fee
+
+    def get_ticket(self, plate_number: str):
+        with self.__tickets_lock:
+            return self.__tickets.get(plate_number)
+
+    def occupancy(self):
+        """Occupied spots per vehicle type, from the levels' running counters"""
+        totals = {VehicleType.CAR: 0, VehicleType.BIKE: 0}
+        for level in self.__levels:
+            for vehicle_type, count in level.occupied.items():
+                totals[vehicle_type] += count
+        return totals
+
+# ----------- Concurrent Gate Benchmark -----------
+import random
+import sys
+
+def benchmark_gates(num_gates=8, num_levels=4, spots_per_level=500, ops_per_gate=20_000):
+    """Gates park and exit cars concurrently through park_vehicle/exit_vehicle,
+    each preferring its own level; checks that no spot is ever ticketed to two
+    vehicles at once."""
+    lot = object.__new__(ParkingLot)
+    lot._init_spots(spots_per_level, spots_per_level // 5, None, num_levels)
+    holders = {}            # spot_id -> plate currently holding it
+    double_assigned = []
+    rejected = [0]
+
+    def gate(gate_id):
+        rng = random.Random(gate_id)
+        mine = []               # (plate, spot_id) parked by this gate
+        for i in range(ops_per_gate):
+            if mine and rng.random() < 0.45:
+                plate, spot_id = mine.pop(rng.randrange(len(mine)))
+                del holders[spot_id]
+                lot.exit_vehicle(plate)
+                continue
+            vehicle = VehicleFactory.create_vehicle(rng.choice(["car", "car", "bike"]), f"G{gate_id}-{i}")
+            if lot.park_vehicle(vehicle, preferred_level=gate_id % num_levels):
+                spot_id = lot.get_ticket(vehicle.plate_number).spot_id
+                if holders.setdefault(spot_id, vehicle.plate_number) != vehicle.plate_number:
+                    double_assigned.append(spot_id)
+                mine.append((vehicle.plate_number, spot_id))
+            else:
+                rejected[0] += 1
+
+    threads = [threading.Thread(target=gate, args=(g,)) for g in range(num_gates)]
+    lot.quiet = True
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    total = num_gates * ops_per_gate
+    occupied = sum(lot.occupancy().values())
+    print(f"{num_gates} gates, {num_levels} levels: {total / elapsed:,.0f} ops/s, "
+          f"rejected: {rejected[0]}, double-assigned spots: {len(double_assigned)}, "
+          f"occupied {occupied} vs {len(holders)} ticketed")
+
+# ----------- Trace-Driven Load Simulator -----------
+import csv
+import json
+
+def generate_trace(hours=24.0, arrivals_per_hour=600.0, mean_dwell_minutes=90.0, bike_share=0.2, seed=11):
+    """Poisson arrivals with exponential dwell times: [(arrival_s, plate, vehicle_type, dwell_s)]"""
+    rng = random.Random(seed)
+    trace, t, i = [], 0.0, 0
+    horizon = hours * 3600
+    while True:
+        t += rng.expovariate(arrivals_per_hour / 3600)
+        if t >= horizon:
+            return trace
+        vehicle_type = "bike" if rng.random() < bike_share else "car"
+        trace.append((t, f"SIM{i}", vehicle_type, rng.expovariate(1 / (mean_dwell_minutes * 60))))
+        i += 1
+
+def load_trace(path):
+    """Read a trace CSV with columns arrival_s,plate,vehicle_type,dwell_s"""
+    with open(path, newline="") as f:
+        return [(float(row["arrival_s"]), row["plate"], row["vehicle_type"], float(row["dwell_s"]))
+                for row in csv.DictReader(f)]
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
+
+def simulate(trace, strategy: ParkingStrategy = None, num_car_spots=800, num_bike_spots=200, num_levels=1,
+             sample_every_s=900.0):
+    """Replay a trace against a fresh lot; returns latency, rejection and utilization metrics"""
+    lot = object.__new__(ParkingLot)
+    lot._init_spots(num_car_spots, num_bike_spots, strategy, num_levels)
+    lot.quiet = True    # time the lot itself, not message formatting
+    capacity = {VehicleType.CAR: num_car_spots * num_levels, VehicleType.BIKE: num_bike_spots * num_levels}
+    events = [(arrival, 0, plate, vehicle_type, dwell) for arrival, plate, vehicle_type, dwell in trace]
+    heapq.heapify(events)  # kind 0 = arrival, 1 = departure
+    park_latency, exit_latency, utilization = [], [], []
+    rejected = 0
+    next_sample = 0.0
+    while events:
+        t, kind, plate, vehicle_type, dwell = heapq.heappop(events)
+        while next_sample <= t:
+            occupied = lot.occupancy()
+            utilization.append({"t_s": next_sample, **{vt: occupied[vt] / capacity[vt] if capacity[vt] else 0.0
+                                                      for vt in capacity}})
+            next_sample += sample_every_s
+        if kind == 0:
+            vehicle = VehicleFactory.create_vehicle(vehicle_type, plate)
+            start = time.perf_counter()
+            parked = lot.park_vehicle(vehicle, now=t)
+            park_latency.append(time.perf_counter() - start)
+            if parked:
+                heapq.heappush(events, (t + dwell, 1, plate, vehicle_type, 0.0))
+            else:
+                rejected += 1
+        else:
+            start = time.perf_counter()
+            lot.exit_vehicle(plate, now=t)
+            exit_latency.append(time.perf_counter() - start)
+    return {
+        "strategy": type(lot.strategy).__name__,
+        "arrivals": len(trace),
+        "rejection_rate": rejected / len(trace) if trace else 0.0,
+        "park_latency_us": {"p50": _percentile(park_latency, 50) * 1e6, "p99": _percentile(park_latency, 99) * 1e6},
+        "exit_latency_us": {"p50": _percentile(exit_latency, 50) * 1e6, "p99": _percentile(exit_latency, 99) * 1e6},
+        "utilization": utilization,
+    }
+
+def run_simulations(output_path, strategies=None, trace=None, **lot_options):
+    """Simulate each strategy on the same trace and write the results as JSON"""
+    trace = trace if trace is not None else generate_trace()
+    results = [simulate(trace, strategy, **lot_options) for strategy in (strategies or [NearestSpotStrategy()])]
+    with open(output_path, "w") as f:
+        json.dump({"lot": lot_options, "results": results}, f, indent=2)
+    for result in results:
+        print(f"{result['strategy']}: rejection {result['rejection_rate']:.1%}, "
+              f"park p50/p99 {result['park_latency_us']['p50']:.1f}/{result['park_latency_us']['p99']:.1f} us, "
+              f"exit p50/p99 {result['exit_latency_us']['p50']:.1f}/{result['exit_latency_us']['p99']:.1f} us")
+    return results
+
 # ----------- Client Code (No direct object creation) -----------
 if __name__ == "__main__":
     lot = ParkingLot.get_instance(num_car_spots=2, num_bike_spots=2)  # Singleton accessor
@@ -119,7 +431,19 @@ if __name__ == "__main__":
     # Leave a spot
     lot.leave_spot("C0")
 
+    # Exit by plate with a fee from the rate strategy
+    lot.park_vehicle(VehicleFactory.create_vehicle("car", "CAR999"))  # duplicate plate is rejected
+    print("Occupancy:", lot.occupancy())
+    lot.exit_vehicle("CAR999", now=lot.get_ticket("CAR999").entry_time + 2.5 * 3600)
+    print("Occupancy:", lot.occupancy())
+
     # Check Singleton behavior
     lot2 = ParkingLot.get_instance()
     print("lot and lot2 are same:", lot is lot2)
 
+    if "--bench" in sys.argv:
+        benchmark_gates()
+
+    if "--simulate" in sys.argv:
+        args = sys.argv[sys.argv.index("--simulate") + 1:]
+        run_simulations(args[0] if args else "parking_simulation.json")
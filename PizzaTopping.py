@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
+from array import array
+import itertools
+import math
 import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; ledger aggregations fall back to pure Python
+    np = None
 
 # ----------- Component -----------
 class Pizza(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_description(self) -> str:
         pass
@@ -48,25 +59,57 @@ class ToppingDecorator(Pizza, ABC):
 
 # ----------- Concrete Toppings -----------
 class Cheese(ToppingDecorator):
+    label = "Cheese"
+    price = 1.5
+
     def get_description(self) -> str:
-        return self.pizza.get_description() + ", Cheese"
+        return self.pizza.get_description() + ", " + self.label
 
     def get_cost(self) -> float:
-        return self.pizza.get_cost() + 1.5
+        return self.pizza.get_cost() + self.price
 
 class PepperoniTopping(ToppingDecorator):
+    label = "Pepperoni"
+    price = 2.0
+
     def get_description(self) -> str:
-        return self.pizza.get_description() + ", Pepperoni"
+        return self.pizza.get_description() + ", " + self.label
 
     def get_cost(self) -> float:
-        return self.pizza.get_cost() + 2.0
+        return self.pizza.get_cost() + self.price
 
 class Veggies(ToppingDecorator):
+    label = "Veggies"
+    price = 1.0
+
+    def get_description(self) -> str:
+        return self.pizza.get_description() + ", " + self.label
+
+    def get_cost(self) -> float:
+        return self.pizza.get_cost() + self.price
+
+# ----------- Compact Pizza -----------
+class CompactPizza(Pizza):
+    """A base pizza plus a topping-count vector, with cost and description
+    computed once instead of on every call through a decorator chain."""
+    __slots__ = ("base", "topping_counts", "_description", "_cost")
+
+    def __init__(self, base: Pizza, toppings: list[type]):
+        self.base = base
+        counts = dict.fromkeys(PizzaFactory.topping_map.values(), 0)
+        cost = base.get_cost()
+        for topping_cls in toppings:
+            counts[topping_cls] += 1
+            cost += topping_cls.price
+        self.topping_counts = tuple(counts.values())  # ordered like PizzaFactory.topping_map
+        self._description = ", ".join([base.get_description()] + [t.label for t in toppings])
+        self._cost = cost
+
     def get_description(self) -> str:
-        return self.pizza.get_description() + ", Veggies"
+        return self._description
 
     def get_cost(self) -> float:
-        return self.pizza.get_cost() + 1.0
+        return self._cost
 
 # ----------- Factory -----------
 class PizzaFactory:
@@ -83,20 +126,211 @@ class PizzaFactory:
     }
 
     @staticmethod
-    def create_pizza(base_type: str, toppings: list[str]) -> Pizza:
+    def create_pizza(base_type: str, toppings: list[str], compact: bool = False) -> Pizza:
         base_cls = PizzaFactory.pizza_map.get(base_type.lower())
         if not base_cls:
             raise ValueError(f"Unknown pizza type: {base_type}")
         pizza = base_cls()
 
+        topping_classes = []
         for topping in toppings:
             topping_cls = PizzaFactory.topping_map.get(topping.lower())
             if not topping_cls:
                 raise ValueError(f"Unknown topping: {topping}")
-            pizza = topping_cls(pizza)
+            topping_classes.append(topping_cls)
 
+        if compact:
+            return CompactPizza(pizza, topping_classes)
+        for topping_cls in topping_classes:
+            pizza = topping_cls(pizza)
         return pizza
 
+# ----------- Columnar Sales Ledger -----------
+def _decompose(pizza: Pizza):
+    """Return (base pizza, topping-count tuple ordered like PizzaFactory.topping_map)."""
+    if isinstance(pizza, CompactPizza):
+        return pizza.base, pizza.topping_counts
+    counts = dict.fromkeys(PizzaFactory.topping_map.values(), 0)
+    while isinstance(pizza, ToppingDecorator):
+        if type(pizza) in counts:  # unregistered toppings only show up in the price
+            counts[type(pizza)] += 1
+        pizza = pizza.pizza
+    return pizza, tuple(counts.values())
+
+def _percentile(sorted_values, q):
+    # Linear interpolation between closest ranks, matching numpy.percentile's default
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+_DENSE_LIMIT = 1 << 22  # largest key range aggregated with bincount regardless of row count
+
+class SalesLedger:
+    """Append-only, array-backed columns of sales. Cancellations are appended
+    as refund rows (quantity -1, negative price) so history is never rewritten.
+    Pizzas whose base is not in PizzaFactory are recorded under "Other Pizza"."""
+
+    def __init__(self):
+        self.base_names = [base_cls().get_description() for base_cls in PizzaFactory.pizza_map.values()]
+        self.other_base_id = len(self.base_names)
+        self.base_names.append("Other Pizza")
+        self.topping_classes = list(PizzaFactory.topping_map.values())
+        self.__base_ids = {base_cls: i for i, base_cls in enumerate(PizzaFactory.pizza_map.values())}
+        self.base_id = array('B')
+        self.topping_counts = [array('B') for _ in self.topping_classes]  # one column per topping
+        self.quantity = array('b')
+        self.price = array('d')
+        self.timestamp = array('d')
+
+    def __len__(self):
+        return len(self.price)
+
+    def record(self, base_id: int, topping_counts, price: float, timestamp: float, quantity: int = 1):
+        # Validate the whole row first so a bad value never leaves the columns misaligned
+        topping_counts = tuple(topping_counts)
+        if not 0 <= base_id < len(self.base_names):
+            raise ValueError(f"Unknown base id: {base_id}")
+        if len(topping_counts) != len(self.topping_counts) or not all(0 <= c <= 255 for c in topping_counts):
+            raise ValueError(f"Topping counts must be {len(self.topping_counts)} values in 0..255: {topping_counts}")
+        if not -128 <= quantity <= 127:
+            raise ValueError(f"Quantity out of range -128..127: {quantity}")
+        self.base_id.append(base_id)
+        for column, count in zip(self.topping_counts, topping_counts):
+            column.append(count)
+        self.quantity.append(quantity)
+        self.price.append(price * quantity)
+        self.timestamp.append(timestamp)
+
+    def record_pizza(self, pizza: Pizza, price: float = None, timestamp: float = None, quantity: int = 1):
+        base, counts = _decompose(pizza)
+        self.record(self.__base_ids.get(type(base), self.other_base_id), counts,
+                    pizza.get_cost() if price is None else price,
+                    time.time() if timestamp is None else timestamp, quantity)
+
+    def _columns(self):
+        # Zero-copy NumPy views; drop them before appending again
+        return (np.frombuffer(self.base_id, dtype=np.uint8),
+                [np.frombuffer(c, dtype=np.uint8) for c in self.topping_counts],
+                np.frombuffer(self.quantity, dtype=np.int8),
+                np.frombuffer(self.price, dtype=np.float64),
+                np.frombuffer(self.timestamp, dtype=np.float64))
+
+    def revenue_by_base(self) -> dict:
+        if np is not None and len(self):
+            base_id, _, _, price, _ = self._columns()
+            sums = np.bincount(base_id, weights=price, minlength=len(self.base_names))
+            return dict(zip(self.base_names, sums.tolist()))
+        sums = [0.0] * len(self.base_names)
+        for base_id, price in zip(self.base_id, self.price):
+            sums[base_id] += price
+        return dict(zip(self.base_names, sums))
+
+    def revenue_by_topping(self) -> dict:
+        """Revenue contributed by each topping: net units sold times its price."""
+        result = {}
+        if np is not None and len(self):
+            _, counts, quantity, _, _ = self._columns()
+            for topping_cls, column in zip(self.topping_classes, counts):
+                result[topping_cls.label] = float(np.dot(column, quantity)) * topping_cls.price
+            return result
+        for topping_cls, column in zip(self.topping_classes, self.topping_counts):
+            result[topping_cls.label] = sum(c * q for c, q in zip(column, self.quantity)) * topping_cls.price
+        return result
+
+    def revenue_by_time_bucket(self, bucket_seconds: float = 3600.0) -> dict:
+        """Net revenue per bucket, keyed by the bucket's start timestamp."""
+        if np is not None and len(self):
+            _, _, _, price, timestamp = self._columns()
+            # floor(t / size) rather than floor_divide, whose float remainder is several times slower
+            buckets = np.floor(timestamp / bucket_seconds).astype(np.int64)
+            first = int(buckets.min())
+            span = int(buckets.max()) - first + 1
+            if span > _DENSE_LIMIT + 4 * len(buckets):
+                keys, inverse = np.unique(buckets, return_inverse=True)
+                sums = np.bincount(inverse, weights=price)
+            else:
+                # Dense bucket range: bincount is linear, unlike np.unique's sort
+                offsets = buckets - first
+                present = np.flatnonzero(np.bincount(offsets, minlength=span))
+                sums = np.bincount(offsets, weights=price, minlength=span)[present]
+                keys = present + first
+            return dict(zip((keys * bucket_seconds).tolist(), sums.tolist()))
+        sums = {}
+        for price, timestamp in zip(self.price, self.timestamp):
+            key = math.floor(timestamp / bucket_seconds) * bucket_seconds
+            sums[key] = sums.get(key, 0.0) + price
+        return dict(sorted(sums.items()))
+
+    def top_combos(self, n: int = 5) -> list:
+        """The n most ordered (base, toppings) combinations as (description, net orders, revenue)."""
+        if np is not None and len(self):
+            base_id, counts, quantity, price, _ = self._columns()
+            # Mixed-radix key sized by each column's largest count: same order as the
+            # base-256 key, but dense enough to aggregate with bincount instead of sorting
+            radices = [int(column.max()) + 1 for column in counts]
+            space = len(self.base_names)
+            for radix in radices:
+                space *= radix
+            keys = base_id.astype(np.int64)
+            for column, radix in zip(counts, radices):
+                keys = keys * radix + column
+            if space > _DENSE_LIMIT + 4 * len(keys):
+                combos, inverse = np.unique(keys, return_inverse=True)
+            else:
+                rows = np.bincount(keys, minlength=space)
+                combos = np.flatnonzero(rows)
+                inverse = keys
+            orders = np.bincount(inverse, weights=quantity)
+            revenue = np.bincount(inverse, weights=price)
+            if len(orders) > len(combos):
+                orders, revenue = orders[combos], revenue[combos]
+            ranked = np.lexsort((combos, -orders))[:n]
+            return [(self._describe_combo(self._radix256(int(combos[i]), radices)), int(orders[i]), float(revenue[i]))
+                    for i in ranked]
+        totals = {}
+        for row in zip(self.base_id, *self.topping_counts, self.quantity, self.price):
+            key = 0
+            for value in row[:-2]:
+                key = key * 256 + value
+            orders, revenue = totals.get(key, (0, 0.0))
+            totals[key] = (orders + row[-2], revenue + row[-1])
+        ranked = sorted(totals.items(), key=lambda item: (-item[1][0], item[0]))[:n]
+        return [(self._describe_combo(key), orders, revenue) for key, (orders, revenue) in ranked]
+
+    @staticmethod
+    def _radix256(key: int, radices) -> int:
+        """Re-encode a mixed-radix combo key as the base-256 key _describe_combo reads"""
+        counts = []
+        for radix in reversed(radices):
+            key, count = divmod(key, radix)
+            counts.append(count)
+        for count in reversed(counts):
+            key = key * 256 + count
+        return key
+
+    def _describe_combo(self, key: int) -> str:
+        counts = []
+        for _ in self.topping_classes:
+            key, count = divmod(key, 256)
+            counts.append(count)
+        parts = [self.base_names[key]]
+        for topping_cls, count in zip(self.topping_classes, reversed(counts)):
+            if count:
+                parts.append(topping_cls.label if count == 1 else f"{count}x {topping_cls.label}")
+        return ", ".join(parts)
+
+    def price_percentiles(self, percentiles=(50, 90, 99)) -> dict:
+        """Percentiles of sale prices, ignoring refund rows."""
+        if not len(self):
+            return {}
+        if np is not None:
+            _, _, quantity, price, _ = self._columns()
+            values = np.percentile(price[quantity > 0], percentiles)
+            return dict(zip(percentiles, values.tolist()))
+        sales = sorted(p for p, q in zip(self.price, self.quantity) if q > 0)
+        return {q: _percentile(sales, q) for q in percentiles}
+
 # ----------- Singleton Pizza Order Manager -----------
 class PizzaOrderManager:
     __instance = None
@@ -108,21 +342,87 @@ class PizzaOrderManager:
             with cls.__lock:
                 if cls.__instance is None:
                     cls.__instance = super(PizzaOrderManager, cls).__new__(cls)
-                    cls.__instance.__orders = []
+                    cls.__instance.__orders = {}  # order_id -> (pizza, cost), insertion ordered
+                    cls.__instance.__next_id = itertools.count(1)
+                    cls.__instance.order_count = 0
+                    cls.__instance.revenue = 0.0
+                    cls.__instance.ledger = SalesLedger()
         return cls.__instance
 
-    def place_order(self, pizza: Pizza):
-        self.__orders.append(pizza)
+    def place_order(self, pizza: Pizza) -> int:
+        order_id = next(self.__next_id)
+        cost = pizza.get_cost()
+        self.ledger.record_pizza(pizza, cost)  # may reject the order; nothing is stored until it succeeds
+        self.__orders[order_id] = (pizza, cost)
+        self.order_count += 1
+        self.revenue += cost
+        return order_id
 
-    def cancel_order(self, index: int):
-        if 0 <= index < len(self.__orders):
-            return self.__orders.pop(index)
-        raise IndexError("Invalid order index")
+    def cancel_order(self, order_id: int) -> Pizza:
+        entry = self.__orders.get(order_id)
+        if entry is None:
+            raise KeyError(f"Invalid order id: {order_id}")
+        pizza, cost = entry
+        self.ledger.record_pizza(pizza, cost, quantity=-1)
+        del self.__orders[order_id]
+        self.order_count -= 1
+        self.revenue -= cost
+        return pizza
+
+    def get_order(self, order_id: int) -> Pizza:
+        entry = self.__orders.get(order_id)
+        if entry is None:
+            raise KeyError(f"Invalid order id: {order_id}")
+        return entry[0]
 
     def print_orders(self):
         print("Current Orders:")
-        for i, pizza in enumerate(self.__orders, 1):
-            print(f"{i}. {pizza.get_description()} - ${pizza.get_cost():.2f}")
+        for order_id, (pizza, cost) in self.__orders.items():
+            print(f"{order_id}. {pizza.get_description()} - ${cost:.2f}")
+        print(f"Total: {self.order_count} orders, ${self.revenue:.2f}")
+
+# ----------- Benchmark -----------
+import random
+import sys
+
+def benchmark_pizza_forms(depths=(1, 5, 10, 25, 50), calls: int = 20_000):
+    """Time get_cost() + get_description() on decorator chains vs compact pizzas."""
+    toppings = list(PizzaFactory.topping_map)
+    print(f"{'depth':>5} {'chain us/call':>14} {'compact us/call':>16}")
+    for depth in depths:
+        names = [toppings[i % len(toppings)] for i in range(depth)]
+        timings = []
+        for compact in (False, True):
+            pizza = PizzaFactory.create_pizza("margherita", names, compact=compact)
+            start = time.perf_counter()
+            for _ in range(calls):
+                pizza.get_cost()
+                pizza.get_description()
+            timings.append((time.perf_counter() - start) / calls * 1e6)
+        print(f"{depth:>5} {timings[0]:>14.3f} {timings[1]:>16.3f}")
+
+def benchmark_ledger(num_orders: int = 1_000_000, days: int = 30):
+    """Fill a ledger with random orders and time each aggregation."""
+    rng = random.Random(42)
+    ledger = SalesLedger()
+    bases = list(PizzaFactory.pizza_map.values())
+    start_ts = time.time() - days * 86400
+    for _ in range(num_orders):
+        base_id = rng.randrange(len(bases))
+        counts = [rng.randrange(3) for _ in ledger.topping_classes]
+        price = bases[base_id]().get_cost() + sum(c * t.price for c, t in zip(counts, ledger.topping_classes))
+        ledger.record(base_id, counts, price, start_ts + rng.random() * days * 86400)
+    bytes_used = sum(col.itemsize * len(col) for col in
+                     [ledger.base_id, ledger.quantity, ledger.price, ledger.timestamp] + ledger.topping_counts)
+    print(f"{len(ledger)} orders, {bytes_used / len(ledger):.0f} bytes/order, numpy={'yes' if np else 'no'}")
+    for label, query in [("by base", ledger.revenue_by_base),
+                         ("by topping", ledger.revenue_by_topping),
+                         ("by day", lambda: ledger.revenue_by_time_bucket(86400)),
+                         ("top 5 combos", lambda: ledger.top_combos(5)),
+                         ("percentiles", ledger.price_percentiles)]:
+        start = time.perf_counter()
+        query()
+        print(f"{label:>14}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
 
 # ----------- Client Code (No direct object creation) -----------
 if __name__ == "__main__":
@@ -139,3 +439,18 @@ if __name__ == "__main__":
         manager.place_order(pizza)
 
     manager.print_orders()
+
+    # Order ids stay stable when earlier orders are cancelled
+    manager.cancel_order(1)
+    manager.print_orders()
+
+    ledger = manager.ledger
+    print("Revenue by base:", ledger.revenue_by_base())
+    print("Top combos:", ledger.top_combos(2))
+
+    compact = PizzaFactory.create_pizza("margherita", ["cheese", "pepperoni", "veggies"], compact=True)
+    print(f"Compact: {compact.get_description()} - ${compact.get_cost():.2f}")
+
+    if "--bench" in sys.argv:
+        benchmark_pizza_forms()
+        benchmark_ledger()